@@ -2,6 +2,81 @@ import numpy as np
 from abc import ABC, abstractmethod
 from .quadrature import Quadrature
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 单元数达到该阈值时才使用 Numba 批量内核 (少量单元不值得首次 JIT 编译开销)
+NUMBA_MIN_ELEMS = 256
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _c3d8_ke_batch(X, D, dN_gp, w_gp, Ke_out, bad):
+        """
+        批量 C3D8 单元刚度内核 (逐单元并行)
+
+        与 C3D8Element.calc_Ke 的算法一致：逐高斯点 J = dN/dξ · X，
+        dN/dx = J⁻¹ · dN/dξ，Ke += Bᵀ D B · detJ · w。
+
+        Args:
+            X: 单元节点坐标 (E, 8, 3)
+            D: 单元弹性矩阵 (E, 6, 6)
+            dN_gp: 各高斯点形函数局部导数 (G, 3, 8)
+            w_gp: 各高斯点权重 (G,)
+            Ke_out: 输出单元刚度 (E, 24, 24)
+            bad: 输出标志 (E,)，雅可比行列式非正的单元置 1
+        """
+        for e in prange(X.shape[0]):
+            Xe = X[e]
+            Ke = np.zeros((24, 24))
+            B = np.zeros((6, 24))
+            J = np.empty((3, 3))
+            Jinv = np.empty((3, 3))
+            for g in range(dN_gp.shape[0]):
+                dN = dN_gp[g]
+                for a in range(3):
+                    for b in range(3):
+                        acc = 0.0
+                        for i in range(8):
+                            acc += dN[a, i] * Xe[i, b]
+                        J[a, b] = acc
+                detJ = (J[0, 0] * (J[1, 1] * J[2, 2] - J[1, 2] * J[2, 1])
+                        - J[0, 1] * (J[1, 0] * J[2, 2] - J[1, 2] * J[2, 0])
+                        + J[0, 2] * (J[1, 0] * J[2, 1] - J[1, 1] * J[2, 0]))
+                if detJ <= 0.0:
+                    bad[e] = 1
+                    break
+                inv_det = 1.0 / detJ
+                Jinv[0, 0] = (J[1, 1] * J[2, 2] - J[1, 2] * J[2, 1]) * inv_det
+                Jinv[0, 1] = (J[0, 2] * J[2, 1] - J[0, 1] * J[2, 2]) * inv_det
+                Jinv[0, 2] = (J[0, 1] * J[1, 2] - J[0, 2] * J[1, 1]) * inv_det
+                Jinv[1, 0] = (J[1, 2] * J[2, 0] - J[1, 0] * J[2, 2]) * inv_det
+                Jinv[1, 1] = (J[0, 0] * J[2, 2] - J[0, 2] * J[2, 0]) * inv_det
+                Jinv[1, 2] = (J[0, 2] * J[1, 0] - J[0, 0] * J[1, 2]) * inv_det
+                Jinv[2, 0] = (J[1, 0] * J[2, 1] - J[1, 1] * J[2, 0]) * inv_det
+                Jinv[2, 1] = (J[0, 1] * J[2, 0] - J[0, 0] * J[2, 1]) * inv_det
+                Jinv[2, 2] = (J[0, 0] * J[1, 1] - J[0, 1] * J[1, 0]) * inv_det
+                for i in range(8):
+                    dx = Jinv[0, 0] * dN[0, i] + Jinv[0, 1] * dN[1, i] + Jinv[0, 2] * dN[2, i]
+                    dy = Jinv[1, 0] * dN[0, i] + Jinv[1, 1] * dN[1, i] + Jinv[1, 2] * dN[2, i]
+                    dz = Jinv[2, 0] * dN[0, i] + Jinv[2, 1] * dN[1, i] + Jinv[2, 2] * dN[2, i]
+                    c = 3 * i
+                    B[0, c] = dx
+                    B[1, c + 1] = dy
+                    B[2, c + 2] = dz
+                    B[3, c] = dy
+                    B[3, c + 1] = dx
+                    B[4, c + 1] = dz
+                    B[4, c + 2] = dy
+                    B[5, c] = dz
+                    B[5, c + 2] = dx
+                DB = D[e] @ B
+                Ke += (B.T @ DB) * (detJ * w_gp[g])
+            Ke_out[e] = Ke
+
 class BaseElement(ABC):
     """
     有限元单元抽象基类。
@@ -162,4 +237,38 @@ class C3D8Element(BaseElement):
                     # 累加刚度矩阵贡献：Ke = ∑ B.T * D * B * detJ * weight
                     Ke += (B.T @ D @ B) * detJ * w_total
                     
-        return Ke
\ No newline at end of file
+        return Ke
+
+    @staticmethod
+    def calc_Ke_batch(elements):
+        """
+        批量计算一组 C3D8 单元的刚度矩阵 (E, 24, 24)
+        
+        Numba 可用且单元数不少于 NUMBA_MIN_ELEMS 时由并行内核逐单元计算，
+        否则逐个调用 calc_Ke。雅可比行列式非正的单元与 calc_Ke 一样抛出 ValueError。
+        """
+        n_elem = len(elements)
+        if not NUMBA_AVAILABLE or n_elem < NUMBA_MIN_ELEMS:
+            Ke_all = np.empty((n_elem, 24, 24))
+            for e, elem in enumerate(elements):
+                Ke_all[e] = elem.calc_Ke()
+            return Ke_all
+        
+        # 高斯点顺序与 calc_Ke 的 (xi, eta, zeta) 三重循环一致
+        points, weights = Quadrature.get_points(order=2)
+        elem0 = elements[0]
+        dN_gp = np.array([
+            elem0._calc_shape_functions(xi, eta, zeta)[1]
+            for xi in points for eta in points for zeta in points
+        ])
+        w_gp = np.array([wi * wj * wk for wi in weights for wj in weights for wk in weights])
+        
+        X = np.array([elem.node_coords_matrix for elem in elements], dtype=np.float64)
+        D = np.array([elem.material.D_matrix for elem in elements], dtype=np.float64)
+        Ke_all = np.empty((n_elem, 24, 24))
+        bad = np.zeros(n_elem, dtype=np.uint8)
+        _c3d8_ke_batch(X, D, dN_gp, w_gp, Ke_all, bad)
+        if bad.any():
+            # 由逐单元算法抛出带坐标信息的原始错误
+            elements[int(np.argmax(bad))].calc_Ke()
+        return Ke_all
\ No newline at end of file
@@ -10,7 +10,6 @@
 
 import numpy as np
 from typing import Optional, Tuple
-import copy
 
 from core.materials import Material, StressResult
 
@@ -82,14 +81,15 @@ class C3D8_Nonlinear_Base:
         """
         提交当前步的状态
         
-        在时间步收敛后调用，将 current 状态深拷贝到 committed。
+        在时间步收敛后调用，将 current 状态引用移交给 committed。
+        
+        无需深拷贝：积分时总是先 clone committed 再交给材料，
+        且材料返回的是新状态对象，committed 中的状态不会被原地修改。
         """
-        for gp_idx in range(8):
-            state = self.gp_states_current[gp_idx]
-            if state is not None and hasattr(state, 'clone'):
-                self.gp_states_committed[gp_idx] = state.clone()
-            elif state is not None:
-                self.gp_states_committed[gp_idx] = copy.deepcopy(state)
+        self.gp_states_committed = [
+            state if state is not None else committed
+            for state, committed in zip(self.gp_states_current, self.gp_states_committed)
+        ]
 
     def get_dof_indices(self) -> np.ndarray:
         """获取单元对应的全局自由度索引"""
@@ -143,10 +143,25 @@ class C3D8_TL(C3D8_Nonlinear_Base):
             F_int: 内力向量 (24,)
             failed: 计算是否失败
         """
+        return self._integrate(u_global, with_tangent=True)
+    
+    def compute_internal_force(self, u_global: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """
+        仅计算单元内力向量 (跳过切线刚度，用于线搜索)
+        
+        Returns:
+            F_int: 内力向量 (24,)
+            failed: 计算是否失败
+        """
+        _, F_int, failed = self._integrate(u_global, with_tangent=False)
+        return F_int, failed
+    
+    def _integrate(self, u_global: np.ndarray, with_tangent: bool) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """高斯积分主循环，with_tangent=False 时不组装 K_mat / K_geo"""
         idx = self.get_dof_indices()
         u_ele = u_global[idx].reshape(8, 3)
         
-        K_tan = np.zeros((24, 24))
+        K_tan = np.zeros((24, 24)) if with_tangent else None
         F_int = np.zeros(24)
         
         for gp_idx in range(8):
@@ -200,12 +215,15 @@ class C3D8_TL(C3D8_Nonlinear_Base):
             B_NL = self._build_B_matrix(F, dN_dX)
             dV = det_J0
             
-            # 材料刚度
-            K_mat = B_NL.T @ D_tang @ B_NL * dV
-            
             # 内力
             F_int += B_NL.T @ S_voigt * dV
             
+            if not with_tangent:
+                continue
+            
+            # 材料刚度
+            K_mat = B_NL.T @ D_tang @ B_NL * dV
+            
             # 几何刚度
             K_geo = self._build_geometric_stiffness(dN_dX, S_tensor, dV)
             
@@ -332,13 +350,22 @@ class C3D8_UL(C3D8_Nonlinear_Base):
 
     def compute_element(self, u_global: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
         """UL 格式的核心计算"""
+        return self._integrate(u_global, with_tangent=True)
+    
+    def compute_internal_force(self, u_global: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """仅计算单元内力向量 (跳过切线刚度，用于线搜索)"""
+        _, F_int, failed = self._integrate(u_global, with_tangent=False)
+        return F_int, failed
+    
+    def _integrate(self, u_global: np.ndarray, with_tangent: bool) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """高斯积分主循环，with_tangent=False 时不组装 K_mat / K_geo"""
         idx = self.get_dof_indices()
         u_ele = u_global[idx].reshape(8, 3)
         
         # 更新当前坐标
         x_curr = self.X_ref + u_ele
         
-        K_tan = np.zeros((24, 24))
+        K_tan = np.zeros((24, 24)) if with_tangent else None
         F_int = np.zeros(24)
         
         for gp_idx in range(8):
@@ -399,6 +426,9 @@ class C3D8_UL(C3D8_Nonlinear_Base):
             # 内力
             F_int += B.T @ sig_voigt * dV
             
+            if not with_tangent:
+                continue
+            
             # 材料刚度
             K_mat = B.T @ D_tang @ B * dV
             
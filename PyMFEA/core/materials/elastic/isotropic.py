@@ -89,8 +89,33 @@ class IsotropicElastic:
             stress: 应力 Voigt 向量 (6,)
             tangent: 切线模量 (6,6)，对于弹性材料等于 D
         """
-        stress = self._D @ strain_voigt
-        return stress, self._D.copy()
+        return self.stress(strain_voigt), self._D.copy()
+    
+    def stress(self, strain_voigt: np.ndarray) -> np.ndarray:
+        """
+        仅计算弹性应力 (不返回切线模量)
+        
+        利用 D 的分块结构直接展开，避免 6x6 矩阵乘法:
+            σ_ii = λ·tr(ε) + 2μ·ε_ii,  τ = μ·γ
+        
+        Args:
+            strain_voigt: 工程应变 Voigt 向量 (6,)
+        
+        Returns:
+            stress: 应力 Voigt 向量 (6,)
+        """
+        e0, e1, e2, g3, g4, g5 = strain_voigt
+        lam_tr = self._lam * (e0 + e1 + e2)
+        two_mu = 2.0 * self._mu
+        mu = self._mu
+        return np.array([
+            lam_tr + two_mu * e0,
+            lam_tr + two_mu * e1,
+            lam_tr + two_mu * e2,
+            mu * g3,
+            mu * g4,
+            mu * g5,
+        ])
     
     def _build_D_matrix(self) -> np.ndarray:
         """
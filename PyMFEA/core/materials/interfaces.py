@@ -212,20 +212,31 @@ class HardeningLaw(Protocol):
 # 辅助函数
 # =============================================================================
 
+# Voigt 顺序 [11, 22, 33, 23, 13, 12] 与行主序展平 3x3 张量之间的索引表
+_T2V = np.array([0, 4, 8, 5, 2, 1])
+_V2T_I = np.array([[0, 5, 4],
+                   [5, 1, 3],
+                   [4, 3, 2]])
+_T2V_ENG = np.array([1.0, 1.0, 1.0, 2.0, 2.0, 2.0])
+_V2T_ENG = np.array([[1.0, 0.5, 0.5],
+                     [0.5, 1.0, 0.5],
+                     [0.5, 0.5, 1.0]])
+
+
 def tensor_to_voigt(T: np.ndarray, engineering: bool = True) -> np.ndarray:
     """
     将 3x3 对称张量转换为 Voigt 向量
     
     Args:
-        T: 对称张量 (3,3)
+        T: 对称张量 (3,3)，也可为批量 (..., 3, 3)
         engineering: True 返回工程形式 [T11,T22,T33,2T23,2T13,2T12]
                     False 返回张量形式 [T11,T22,T33,T23,T13,T12]
     """
-    factor = 2.0 if engineering else 1.0
-    return np.array([
-        T[0, 0], T[1, 1], T[2, 2],
-        factor * T[1, 2], factor * T[0, 2], factor * T[0, 1]
-    ])
+    T = np.asarray(T, dtype=float)
+    v = T.reshape(T.shape[:-2] + (9,)).take(_T2V, axis=-1)
+    if engineering:
+        v *= _T2V_ENG
+    return v
 
 
 def voigt_to_tensor(v: np.ndarray, engineering: bool = True) -> np.ndarray:
@@ -233,29 +244,21 @@ def voigt_to_tensor(v: np.ndarray, engineering: bool = True) -> np.ndarray:
     将 Voigt 向量转换为 3x3 对称张量
     
     Args:
-        v: Voigt 向量 (6,)
+        v: Voigt 向量 (6,)，也可为批量 (..., 6)
         engineering: True 输入为工程形式，False 输入为张量形式
     """
-    factor = 0.5 if engineering else 1.0
-    return np.array([
-        [v[0], factor * v[5], factor * v[4]],
-        [factor * v[5], v[1], factor * v[3]],
-        [factor * v[4], factor * v[3], v[2]]
-    ])
+    T = np.asarray(v, dtype=float).take(_V2T_I, axis=-1)
+    if engineering:
+        T *= _V2T_ENG
+    return T
 
 
 def stress_to_tensor(s: np.ndarray) -> np.ndarray:
     """将应力 Voigt 向量转换为 3x3 张量 (应力不需要因子)"""
-    return np.array([
-        [s[0], s[5], s[4]],
-        [s[5], s[1], s[3]],
-        [s[4], s[3], s[2]]
-    ])
+    return np.asarray(s, dtype=float).take(_V2T_I, axis=-1)
 
 
 def tensor_to_stress(T: np.ndarray) -> np.ndarray:
     """将 3x3 应力张量转换为 Voigt 向量"""
-    return np.array([
-        T[0, 0], T[1, 1], T[2, 2],
-        T[1, 2], T[0, 2], T[0, 1]
-    ])
+    T = np.asarray(T, dtype=float)
+    return T.reshape(T.shape[:-2] + (9,)).take(_T2V, axis=-1)
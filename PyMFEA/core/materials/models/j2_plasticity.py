@@ -6,7 +6,7 @@ J2 弹塑性材料模型
 """
 
 import numpy as np
-from typing import Optional
+from typing import Optional, Tuple
 
 from ..interfaces import Material, StressResult, tensor_to_voigt
 from ..state import PlasticState
@@ -15,6 +15,104 @@ from ..plastic.yield_functions import VonMises
 from ..plastic.hardening import PerfectPlasticity, LinearIsotropicHardening
 from ..plastic.return_mapping import RadialReturn
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _j2_batch(F, ep_old, lam, mu, sy0, H, stress_out, tangent_out, ep_new, plastic):
+        """
+        批量 J2 本构内核 (逐积分点并行)
+
+        与 compute_stress 的单点算法完全一致：Green-Lagrange 应变 → 弹性试探应力
+        → 径向返回 → 一致切线模量，结果以 Voigt 形式写入输出数组。
+
+        Args:
+            F: 变形梯度 (Q, 3, 3)
+            ep_old: 上一步等效塑性应变 (Q,)
+            lam, mu: Lamé 参数
+            sy0, H: 初始屈服应力与线性硬化模量
+            stress_out: 输出应力 (Q, 6)
+            tangent_out: 输出切线模量 (Q, 6, 6)
+            ep_new: 输出等效塑性应变 (Q,)
+            plastic: 输出是否发生塑性流动 (Q,)
+        """
+        for q in prange(F.shape[0]):
+            Fq = F[q]
+            C = Fq.T @ Fq
+            e0 = 0.5 * (C[0, 0] - 1.0)
+            e1 = 0.5 * (C[1, 1] - 1.0)
+            e2 = 0.5 * (C[2, 2] - 1.0)
+            g3 = C[1, 2]   # 2 * E_yz
+            g4 = C[0, 2]   # 2 * E_xz
+            g5 = C[0, 1]   # 2 * E_xy
+            
+            # 弹性试探应力 σ = λ tr(ε) + 2μ ε, τ = μ γ
+            lam_tr = lam * (e0 + e1 + e2)
+            st = np.empty(6)
+            st[0] = lam_tr + 2.0 * mu * e0
+            st[1] = lam_tr + 2.0 * mu * e1
+            st[2] = lam_tr + 2.0 * mu * e2
+            st[3] = mu * g3
+            st[4] = mu * g4
+            st[5] = mu * g5
+            
+            # 弹性矩阵
+            D = tangent_out[q]
+            D[:, :] = 0.0
+            for i in range(3):
+                for j in range(3):
+                    D[i, j] = lam
+                D[i, i] = lam + 2.0 * mu
+                D[i + 3, i + 3] = mu
+            
+            # 屈服检查
+            p = (st[0] + st[1] + st[2]) / 3.0
+            s = st.copy()
+            s[0] -= p
+            s[1] -= p
+            s[2] -= p
+            seq = np.sqrt(1.5 * (s[0]**2 + s[1]**2 + s[2]**2
+                                 + 2.0 * (s[3]**2 + s[4]**2 + s[5]**2)))
+            f_trial = seq - (sy0 + H * ep_old[q])
+            
+            if f_trial <= 0.0:
+                stress_out[q] = st
+                ep_new[q] = ep_old[q]
+                plastic[q] = False
+                continue
+            
+            # 径向返回
+            d_gamma = f_trial / (3.0 * mu + H)
+            n = np.zeros(6)
+            if seq >= 1e-10:
+                for i in range(3):
+                    n[i] = 1.5 * s[i] / seq
+                    n[i + 3] = 3.0 * s[i + 3] / seq
+            for i in range(6):
+                stress_out[q, i] = st[i] - 2.0 * mu * d_gamma * n[i]
+            ep_new[q] = ep_old[q] + d_gamma
+            plastic[q] = True
+            
+            # 一致切线模量 D - c1 * I_dev' - β (n ⊗ n)
+            if seq < 1e-10:
+                continue
+            c1 = 6.0 * mu * mu * d_gamma / seq
+            c2 = 4.0 * mu * mu / (3.0 * mu + H)
+            beta_n = c2 - c1 * (2.0 / 3.0)
+            for i in range(3):
+                for j in range(3):
+                    D[i, j] -= c1 * (-1.0 / 3.0)
+                D[i, i] -= c1
+                D[i + 3, i + 3] -= c1 * 0.5
+            for i in range(6):
+                for j in range(6):
+                    D[i, j] -= beta_n * n[i] * n[j]
+
 
 class J2PlasticMaterial(Material):
     """
@@ -146,7 +244,7 @@ class J2PlasticMaterial(Material):
         E_voigt = tensor_to_voigt(E_tensor, engineering=True)
         
         # 2. 弹性试探应力
-        stress_trial, _ = self.elastic.compute_stress(E_voigt)
+        stress_trial = self.elastic.stress(E_voigt)
         
         # 3. 返回映射
         stress, tangent, ep_new, is_plastic = self.return_mapping.apply(
@@ -167,6 +265,53 @@ class J2PlasticMaterial(Material):
             stress_type=self._stress_type
         )
     
+    def compute_stress_batch(
+        self,
+        F_all: np.ndarray,
+        ep_old: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量计算多个积分点的应力 (一次调用处理整组单元)
+        
+        安装了 Numba 时使用并行内核，否则逐点调用 compute_stress。
+        
+        Args:
+            F_all: 变形梯度 (Q, 3, 3)
+            ep_old: 各点上一步的等效塑性应变 (Q,)，缺省为 0
+            
+        Returns:
+            stress: PK2 应力 (Q, 6)
+            tangent: 一致切线模量 (Q, 6, 6)
+            ep_new: 更新后的等效塑性应变 (Q,)
+            is_plastic: 是否发生塑性流动 (Q,)
+        """
+        F_all = np.ascontiguousarray(F_all, dtype=np.float64).reshape(-1, 3, 3)
+        Q = F_all.shape[0]
+        if ep_old is None:
+            ep_old = np.zeros(Q)
+        ep_old = np.ascontiguousarray(ep_old, dtype=np.float64)
+        
+        stress = np.empty((Q, 6))
+        tangent = np.empty((Q, 6, 6))
+        ep_new = np.empty(Q)
+        is_plastic = np.empty(Q, dtype=np.bool_)
+        
+        if NUMBA_AVAILABLE:
+            _j2_batch(F_all, ep_old, self.elastic.lam, self.elastic.mu,
+                      self.yield_stress, self.hardening_modulus,
+                      stress, tangent, ep_new, is_plastic)
+            return stress, tangent, ep_new, is_plastic
+        
+        for q in range(Q):
+            result = self.compute_stress(
+                F_all[q], PlasticState(equivalent_plastic_strain=ep_old[q])
+            )
+            stress[q] = result.stress
+            tangent[q] = result.tangent
+            ep_new[q] = result.state.equivalent_plastic_strain
+            is_plastic[q] = result.is_plastic
+        return stress, tangent, ep_new, is_plastic
+    
     def __repr__(self) -> str:
         return (
             f"J2PlasticMaterial(E={self.E:.2e}, nu={self.nu:.3f}, "
@@ -47,6 +47,7 @@ class MainWindow(QMainWindow):
         self.current_stress = None
         self.current_stress_components = None  # 应力分量
         self.current_object = None  # 当前激活的 Part / Assembly 等对象
+        self.visualizer = None  # 复用的 FEMVisualizer (缓存网格，切换结果时只替换字段)
         # 线程管理
         self.worker = None  # 工作线程引用
         self.monitor_dialog = None  # 监控对话框引用
@@ -868,8 +869,7 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            from utils.visualizer import FEMVisualizer
-            visualizer = FEMVisualizer()
+            visualizer = self._get_visualizer()
             
             # 获取节点数据（可能是字典或对象）
             nodes_map = None
@@ -904,6 +904,13 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.message_area.appendPlainText(f"Warning: Failed to add BC/Load visualization: {str(e)}\n")
     
+    def _get_visualizer(self):
+        """返回窗口共用的 FEMVisualizer (首次调用时创建)"""
+        if self.visualizer is None:
+            from utils.visualizer import FEMVisualizer
+            self.visualizer = FEMVisualizer()
+        return self.visualizer
+    
     def _clear_bc_load_actors(self):
         """清除 BC 和 Load 可视化 actors"""
         for actor in self.bc_load_actors:
@@ -916,8 +923,7 @@ class MainWindow(QMainWindow):
     def _update_range_from_data(self, result_type):
         """从数据中更新范围显示"""
         try:
-            from utils.visualizer import FEMVisualizer
-            visualizer = FEMVisualizer()
+            visualizer = self._get_visualizer()
             grid = visualizer.parse_mesh_to_vtk(
                 self.current_mesh['nodes'], 
                 self.current_mesh['elements'], 
@@ -1062,8 +1068,7 @@ class MainWindow(QMainWindow):
             return
 
         try:
-            from utils.visualizer import FEMVisualizer
-            visualizer = FEMVisualizer()
+            visualizer = self._get_visualizer()
             grid = visualizer.parse_mesh_to_vtk(self.inp_data['nodes'], self.inp_data['elements'])
 
             # —— 关键：在仅有网格时也初始化 current_mesh，使视图按钮可用 ——
@@ -1190,8 +1195,7 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            from utils.visualizer import FEMVisualizer
-            visualizer = FEMVisualizer()
+            visualizer = self._get_visualizer()
             grid = visualizer.parse_mesh_to_vtk(
                 self.current_mesh['nodes'], 
                 self.current_mesh['elements'], 
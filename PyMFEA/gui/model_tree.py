@@ -223,7 +223,9 @@ class ModelTreeWidget(QWidget):
                 child.setText(0, f"Fix-Node{bc['node_id']}")
             else:
                 child.setText(0, "Fix")
-            child.setText(1, f"DOF:{bc['dof']+1}") # 显示自由度
+            # 显示自由度 (集合约束为自由度数组)
+            dofs = bc['dofs'] if 'dofs' in bc else [bc['dof']]
+            child.setText(1, "DOF:" + ",".join(str(int(d) + 1) for d in dofs))
             
         # 列出 Loads (Force/Pressure)
         # 过滤掉从surface展开的节点力，只显示surface信息
@@ -238,10 +240,6 @@ class ModelTreeWidget(QWidget):
             # 如果是set载荷，直接显示
             elif 'set_name' in ld:
                 displayed_loads.append(ld)
-            # 如果是节点载荷，但来自surface，跳过（已在surface中显示）
-            elif 'node_id' in ld and 'from_surface' in ld:
-                # 跳过，因为已经在surface中显示了
-                continue
             # 如果是普通节点载荷，显示
             elif 'node_id' in ld:
                 displayed_loads.append(ld)
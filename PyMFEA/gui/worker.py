@@ -14,6 +14,7 @@ from core.element import C3D8Element
 from core.quadrature import Quadrature
 from solver.assembler import GlobalAssembler
 from solver.LinearSolver import LinearSolver
+from solver.boundary_conditions import ConstraintArray
 
 # 2. 非线性相关 (新增)
 from core.element_nonlinear import C3D8_TL, C3D8_UL
@@ -163,41 +164,24 @@ class SolverWorker(QThread):
             # --- 4. 预处理约束与载荷 (展开 Set/Surface 为纯 Node ID) ---
             # 这一步对于 Linear 和 Nonlinear 都是必须的，因为 Solver 只认 Node ID
             
-            # 4.1 展开约束
-            expanded_constraints = []
+            # 4.1 展开约束 (集合约束一次性展开为列式数组)
+            nsets = inp_data.get('nsets', {})
             for cons in inp_data['constraints']:
-                if 'set_name' in cons:
-                    sname = cons['set_name']
-                    if sname in inp_data.get('nsets', {}):
-                        nids = inp_data['nsets'][sname]
-                        for nid in nids:
-                            expanded_constraints.append({
-                                'node_id': nid, 'dof': cons['dof'], 'value': cons['value']
-                            })
-                    else:
-                        self._log(f"Warning: Constraint NSet '{sname}' not found.")
-                elif 'node_id' in cons:
-                    expanded_constraints.append(cons)
+                if 'set_name' in cons and cons['set_name'] not in nsets:
+                    self._log(f"Warning: Constraint NSet '{cons['set_name']}' not found.")
+            expanded_constraints = ConstraintArray.expand_sets(inp_data['constraints'], nsets)
 
-            # 4.2 展开载荷 (注意：inp_reader 已经把 Surface Load 展开成了 node_id 载荷条目)
-            clean_loads = []
-            for load in inp_data['loads']:
-                # 忽略 surface 定义条目本身，只取已被 inp_reader 转换好的 node_id 条目
-                if 'surface_name' in load and 'node_id' not in load:
-                    continue 
-                
-                if 'set_name' in load:
-                    sname = load['set_name']
-                    if sname in inp_data.get('nsets', {}):
-                        nids = inp_data['nsets'][sname]
-                        for nid in nids:
-                            clean_loads.append({
-                                'node_id': nid, 'dof': load['dof'], 'value': load['value']
-                            })
-                    else:
-                        self._log(f"Warning: Load NSet '{sname}' not found.")
-                elif 'node_id' in load:
-                    clean_loads.append(load)
+            # 4.2 展开载荷
+            # 忽略 surface 定义条目本身，Surface Load 已由 inp_reader 展开为列式节点力 (point_loads)
+            node_loads = [ld for ld in inp_data['loads'] if 'surface_name' not in ld]
+            for load in node_loads:
+                if 'set_name' in load and load['set_name'] not in nsets:
+                    self._log(f"Warning: Load NSet '{load['set_name']}' not found.")
+            clean_loads = ConstraintArray.expand_sets(node_loads, nsets)
+            if 'point_loads' in inp_data:
+                clean_loads = ConstraintArray.concatenate(
+                    [clean_loads, ConstraintArray(**inp_data['point_loads'])]
+                )
 
             # --- 5. 执行求解 (分支) ---
             U_global = None
@@ -220,16 +204,21 @@ class SolverWorker(QThread):
                 
                 # 组装线性载荷向量 F_global
                 F_global = np.zeros(num_nodes * 3)
-                sorted_nids = sorted(nodes_map.keys())
-                nid_to_idx = {nid: i for i, nid in enumerate(sorted_nids)}
+                sorted_nids = np.array(sorted(nodes_map.keys()), dtype=np.int64)
                 
-                for ld in clean_loads:
-                    if self.isInterruptionRequested():
-                        return
-                    if ld['node_id'] in nid_to_idx:
-                        idx = nid_to_idx[ld['node_id']]
-                        # 简单的 += 叠加
-                        F_global[idx * 3 + ld['dof']] += ld['value']
+                # 节点 ID -> 排序后的行号，未定义的节点或无效自由度忽略；重复项按 += 叠加
+                load_ids = clean_loads.node_ids
+                if len(sorted_nids) > 0:
+                    idx = np.clip(np.searchsorted(sorted_nids, load_ids), 0, len(sorted_nids) - 1)
+                    found = (sorted_nids[idx] == load_ids) & (clean_loads.dofs >= 0) & (clean_loads.dofs < 3)
+                else:
+                    idx = np.zeros(len(load_ids), dtype=np.int64)
+                    found = np.zeros(len(load_ids), dtype=bool)
+                n_missing = int(np.count_nonzero(~found))
+                if n_missing:
+                    self._log(f"Warning: {n_missing} load entries reference undefined nodes/DOFs and were ignored.")
+                np.add.at(F_global, idx[found] * 3 + clean_loads.dofs[found],
+                          clean_loads.values[found])
                 
                 # 检查中断请求
                 if self.isInterruptionRequested():
@@ -1,6 +1,37 @@
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from scipy.sparse import coo_matrix
 
+from core.element import C3D8Element
+
+def for_each_element(num_elem, compute, n_workers=1):
+    """
+    对每个单元索引 e 调用 compute(e)，任一调用返回 True (失败) 时返回 True
+    
+    n_workers > 1 时把单元划分为 n_workers 个连续块交给线程池并行执行；
+    compute 只应写入第 e 个结果槽位 (及第 e 个单元自身的状态)，块之间互不干扰。
+    单元计算中的 NumPy 运算会释放 GIL，纯 Python 部分仍受 GIL 限制。
+    """
+    n_chunks = min(int(n_workers), num_elem)
+    if n_chunks <= 1:
+        for e in range(num_elem):
+            if compute(e):
+                return True
+        return False
+    
+    def run_chunk(chunk):
+        for e in chunk:
+            if compute(e):
+                return True
+        return False
+    
+    chunks = np.array_split(np.arange(num_elem), n_chunks)
+    with ThreadPoolExecutor(max_workers=n_chunks) as pool:
+        return any(list(pool.map(run_chunk, chunks)))
+
+
 class GlobalAssembler:
     """
     全局刚度矩阵组装器
@@ -8,14 +39,25 @@ class GlobalAssembler:
     使用 COO (Coordinate) 格式高效构建稀疏矩阵
     """
     
-    def __init__(self, elements, num_nodes):
+    def __init__(self, elements, num_nodes, verbose=True, n_workers=1):
         """
         Args:
             elements (list): 包含所有 Element 对象的列表
             num_nodes (int): 网格中的总节点数 (用于确定矩阵大小)
+            verbose (bool): 是否打印组装进度 (非线性迭代中反复组装时应关闭)
+            n_workers (int): 单元计算使用的线程数，1 为串行。各单元只写入自己的
+                结果槽位 (以及自身的积分点状态)，分块并行无数据竞争
         """
         self.elements = elements
         self.num_nodes = num_nodes
+        self.verbose = verbose
+        self.n_workers = max(1, int(n_workers))
+        
+        # 网格拓扑相关的索引缓存 (首次组装时构建)，以构建时的单元序列为键
+        self._cached_elements = None
+        self._elem_dofs = None
+        self._coo_rows = None
+        self._coo_cols = None
         self.total_dof = num_nodes * 3  # 每个节点 3 个自由度 (u, v, w)
 
     def assemble(self):
@@ -24,7 +66,17 @@ class GlobalAssembler:
         Returns:
             K_global (scipy.sparse.csr_matrix): 压缩稀疏行格式的全局刚度矩阵
         """
-        # 使用通用组装接口，传入线性单元计算回调
+        # 全部为 C3D8 线弹性单元时，由批量内核 (Numba 可用时并行) 一次算出所有 Ke
+        if self.elements and all(type(elem) is C3D8Element for elem in self.elements):
+            if self.verbose:
+                print(f"开始组装全局刚度矩阵... (单元数: {len(self.elements)}, 总DOF: {self.total_dof})")
+            Ke_all = C3D8Element.calc_Ke_batch(self.elements)
+            K_global = self._build_csr(Ke_all.reshape(len(self.elements), -1))
+            if self.verbose:
+                print("全局刚度矩阵组装完成。")
+            return K_global
+        
+        # 其他单元类型使用通用组装接口，传入线性单元计算回调
         def linear_element_routine(elem, u_current):
             Ke = elem.calc_Ke()
             return Ke, None, False  # (K, F_int, failed)
@@ -59,72 +111,142 @@ class GlobalAssembler:
         num_elem = len(self.elements)
         # C3D8 单元每个有 24 个自由度，矩阵大小为 24x24 = 576 个元素
         entries_per_elem = 24 * 24 
-        total_entries = num_elem * entries_per_elem
         
         # 1. 预分配 NumPy 数组 (Pre-allocation)
         # 对应 PDF gstiffm_3d8n.m lines 5-6 
         # 避免在循环中动态调整数组大小，这是高性能的关键
-        rows = np.zeros(total_entries, dtype=np.int32)
-        cols = np.zeros(total_entries, dtype=np.int32)
-        data = np.zeros(total_entries, dtype=np.float64)
-        
-        # 内力向量（仅非线性模式需要）
-        F_int_global = np.zeros(self.total_dof)
+        # 行/列索引只依赖网格拓扑，首次组装后缓存，循环中只填充数值
+        data = np.zeros((num_elem, entries_per_elem), dtype=np.float64)
         
-        ptr = 0  # 指针，记录当前填到了哪个位置
-        assembly_failed = False
+        # 单元内力（仅非线性模式需要），循环结束后一次性散射到全局
+        Fe_all = np.zeros((num_elem, 24))
+        has_force = np.zeros(num_elem, dtype=bool)
         
-        print(f"开始组装全局刚度矩阵... (单元数: {num_elem}, 总DOF: {self.total_dof})")
+        if self.verbose:
+            print(f"开始组装全局刚度矩阵... (单元数: {num_elem}, 总DOF: {self.total_dof})")
         
-        # 2. 遍历所有单元
-        for elem in self.elements:
+        # 2. 遍历所有单元：只做单元级计算，互不依赖 (n_workers > 1 时分块并行)
+        def compute(e):
             # 调用单元计算回调函数
             # 对应 PDF: estiffm_3d8n.m 调用（线性）或非线性单元的 compute_element
-            Ke, Fe, failed = element_routine(elem, u_current)
+            Ke, Fe, failed = element_routine(self.elements[e], u_current)
             
             if failed:
-                assembly_failed = True
-                break
-            
-            # 获取该单元的全局自由度索引 (1x24)
-            # 对应 PDF gstiffm_3d8n.m lines 28-33 [cite: 1237-1248]
-            dofs = elem.get_dof_indices()
+                return True
             
-            # 3. 组装内力向量（如果有）
+            # 3. 记录单元内力（如果有）
             if Fe is not None:
-                # 利用 NumPy 高级索引直接累加
-                F_int_global[dofs] += Fe
+                Fe_all[e] = Fe
+                has_force[e] = True
             
-            # 4. 构建索引网格
-            # r_grid, c_grid 类似于 MATLAB 的 meshgrid
-            # 对应 PDF gstiffm_3d8n.m line 34 [cite: 1251]
-            # indexing='ij' 确保顺序与 Ke.flatten() 匹配
-            r_grid, c_grid = np.meshgrid(dofs, dofs, indexing='ij')
-            
-            # 5. 填充数据到大数组
+            # 4. 填充数据，顺序与缓存的行/列索引 (indexing='ij') 一致
             # 对应 PDF gstiffm_3d8n.m lines 38-40 [cite: 1260-1267]
-            end_ptr = ptr + entries_per_elem
-            
-            rows[ptr:end_ptr] = r_grid.flatten()
-            cols[ptr:end_ptr] = c_grid.flatten()
-            data[ptr:end_ptr] = Ke.flatten()
-            
-            ptr = end_ptr
+            data[e] = Ke.ravel()
+            return False
         
-        if assembly_failed:
+        if self._for_each_element(compute):
             return None, None, True
-            
-        # 6. 创建稀疏矩阵
-        # 对应 PDF gstiffm_3d8n.m line 43 [cite: 1275]
-        # coo_matrix 会自动处理重复索引的累加 (Assembly by summation)
-        K_coo = coo_matrix((data, (rows, cols)), shape=(self.total_dof, self.total_dof))
         
-        # 转换为 CSR (Compressed Sparse Row) 格式，更适合线性方程组求解
-        K_csr = K_coo.tocsr()
+        # 5. 创建稀疏矩阵
+        K_csr = self._build_csr(data)
         
-        print("全局刚度矩阵组装完成。")
+        if self.verbose:
+            print("全局刚度矩阵组装完成。")
         
         # 返回内力向量（线性模式下返回None）
-        F_int_result = F_int_global if u_current is not None else None
-        return K_csr, F_int_result, False
+        if u_current is None:
+            return K_csr, None, False
+        F_int_global = self._scatter_vector(Fe_all) if has_force.any() else np.zeros(self.total_dof)
+        return K_csr, F_int_global, False
+    
+    def _for_each_element(self, compute):
+        """对每个单元索引调用 compute(e)，按 self.n_workers 分块并行"""
+        return for_each_element(len(self.elements), compute, self.n_workers)
+    
+    def _build_csr(self, data):
+        """
+        由单元矩阵数值 (num_elem, 576) 构建全局 CSR 矩阵
+        
+        对应 PDF gstiffm_3d8n.m line 43 [cite: 1275]
+        coo_matrix 会自动处理重复索引的累加 (Assembly by summation)
+        """
+        rows, cols = self._coo_pattern()
+        K_coo = coo_matrix((data.ravel(), (rows, cols)), shape=(self.total_dof, self.total_dof))
+        # 转换为 CSR (Compressed Sparse Row) 格式，更适合线性方程组求解
+        return K_coo.tocsr()
+    
+    def _dof_map(self):
+        """
+        单元自由度映射表 (num_elem, 24)，首次调用时构建并缓存
+        
+        缓存以构建时的单元序列为键：self.elements 被替换、增删或重排后
+        (按对象身份比较) 自动重建，连同 COO 行/列索引一起失效。
+        
+        对应 PDF gstiffm_3d8n.m lines 28-33 [cite: 1237-1248]
+        """
+        if self._elem_dofs is None or not self._same_elements():
+            self._cached_elements = list(self.elements)
+            self._coo_rows = self._coo_cols = None
+            if self.elements:
+                self._elem_dofs = np.array(
+                    [elem.get_dof_indices() for elem in self.elements], dtype=np.int32
+                )
+            else:
+                self._elem_dofs = np.zeros((0, 24), dtype=np.int32)
+        return self._elem_dofs
+    
+    def _same_elements(self):
+        """当前单元序列是否与缓存构建时完全相同 (逐个比较对象身份)"""
+        cached = self._cached_elements
+        return (cached is not None and len(cached) == len(self.elements)
+                and all(map(operator.is_, cached, self.elements)))
+    
+    def _coo_pattern(self):
+        """
+        全局 COO 行/列索引 (与 Ke.ravel() 的 'ij' 顺序对应)，首次调用时构建并缓存
+        
+        对应 PDF gstiffm_3d8n.m line 34 [cite: 1251] 的 meshgrid
+        """
+        dof_map = self._dof_map()
+        if self._coo_rows is None:
+            self._coo_rows = np.repeat(dof_map, 24, axis=1).ravel()
+            self._coo_cols = np.tile(dof_map, (1, 24)).ravel()
+        return self._coo_rows, self._coo_cols
+    
+    def _scatter_vector(self, Fe_all):
+        """将单元向量 (num_elem, 24) 一次性累加为全局向量"""
+        return np.bincount(
+            self._dof_map().ravel(), weights=Fe_all.ravel(), minlength=self.total_dof
+        )
+    
+    def assemble_internal_force(self, element_routine, u_current):
+        """
+        仅组装全局内力向量 (不构建刚度矩阵)
+        
+        用于线搜索等只需要残差的场合，省去 COO 填充与稀疏矩阵转换。
+        
+        Args:
+            element_routine (callable): 单元内力回调函数
+                签名: element_routine(elem, u_current) -> (Fe, failed)
+            u_current (np.ndarray): 当前全局位移向量
+        
+        Returns:
+            F_int_global (np.ndarray or None): 全局内力向量（失败时为None）
+            assembly_failed (bool): 组装是否失败
+        """
+        Fe_all = np.zeros((len(self.elements), 24))
+        
+        def compute(e):
+            Fe, failed = element_routine(self.elements[e], u_current)
+            
+            if failed:
+                return True
+            
+            Fe_all[e] = Fe
+            return False
+        
+        if self._for_each_element(compute):
+            return None, True
+        
+        return self._scatter_vector(Fe_all), False
 
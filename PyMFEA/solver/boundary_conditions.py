@@ -4,10 +4,87 @@
 
 提供一致的罚函数法实现，用于线性和非线性求解器。
 """
+import warnings
+from dataclasses import dataclass
+
 import numpy as np
 import scipy.sparse as sp
 
 
+@dataclass
+class ConstraintArray:
+    """
+    约束/载荷的列式存储 (Struct of Arrays)
+
+    将 [{'node_id': 1, 'dof': 0, 'value': 0.0}, ...] 形式的字典列表
+    一次性转换为三个等长 NumPy 数组，后续罚函数与载荷组装均可向量化完成。
+
+    Attributes:
+        node_ids: 节点 ID (1-based), int64 (n,)
+        dofs: 自由度编号 (0=x, 1=y, 2=z), int64 (n,)
+        values: 约束值 / 载荷值, float64 (n,)
+    """
+    node_ids: np.ndarray
+    dofs: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_dict_list(cls, items) -> 'ConstraintArray':
+        """
+        从字典列表构建 (已为 ConstraintArray 时原样返回)
+
+        Args:
+            items (list of dict): 格式 {'node_id': int, 'dof': int, 'value': float}，
+                'value' 缺省为 0.0
+        """
+        if isinstance(items, cls):
+            return items
+        n = len(items)
+        node_ids = np.fromiter((c['node_id'] for c in items), dtype=np.int64, count=n)
+        dofs = np.fromiter((c['dof'] for c in items), dtype=np.int64, count=n)
+        values = np.fromiter((c.get('value', 0.0) for c in items), dtype=np.float64, count=n)
+        return cls(node_ids, dofs, values)
+
+    @classmethod
+    def expand_sets(cls, items, nsets) -> 'ConstraintArray':
+        """
+        展开 INP 约束条目 (集合约束按 节点 × 自由度 向量化展开)
+
+        Args:
+            items (list of dict): 两种条目可混合
+                {'node_id': int, 'dof': int, 'value': float}
+                {'set_name': str, 'dofs': array-like, 'value': float}
+            nsets (dict): {set_name: 节点 ID 列表}，不存在的集合被忽略
+        """
+        node_items = [c for c in items if 'node_id' in c]
+        parts = [cls.from_dict_list(node_items)]
+        for c in items:
+            if 'node_id' in c or c.get('set_name') not in nsets:
+                continue
+            nids = np.asarray(nsets[c['set_name']], dtype=np.int64)
+            dofs = np.atleast_1d(np.asarray(c.get('dofs', c.get('dof')), dtype=np.int64))
+            # 逐自由度展开：与逐条 {node_id, dof} 字典的顺序一致
+            parts.append(cls(
+                np.tile(nids, len(dofs)),
+                np.repeat(dofs, len(nids)),
+                np.full(len(nids) * len(dofs), float(c.get('value', 0.0))),
+            ))
+        return cls.concatenate(parts)
+
+    @classmethod
+    def concatenate(cls, parts) -> 'ConstraintArray':
+        """按顺序拼接多个 ConstraintArray"""
+        return cls(*(np.concatenate(cols) for cols in zip(
+            *((p.node_ids, p.dofs, p.values) for p in parts))))
+
+    def dof_indices(self, dofs_per_node: int = 3) -> np.ndarray:
+        """全局自由度索引 (node_id - 1) * dofs_per_node + dof"""
+        return (self.node_ids - 1) * dofs_per_node + self.dofs
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+
 class BoundaryConditionHandler:
     """
     统一的边界条件处理器
@@ -23,12 +100,12 @@ class BoundaryConditionHandler:
         罚函数法原理：
         - 对于约束自由度 i，修改刚度矩阵对角元素：K[i,i] += α
         - 修改载荷向量：F[i] += α * prescribed_value
-        - 罚因子 α = max(diag(K)) * penalty_multiplier
+        - 罚因子 α = max(diag(K)) * penalty_multiplier (对角全为 0 时退化为 penalty_multiplier)
         
         Args:
             K: 刚度矩阵 (scipy.sparse matrix 或 numpy array)
             F_or_R: 载荷向量或残差向量 (numpy array)
-            constraints (list of dict): 约束列表
+            constraints (list of dict | ConstraintArray): 约束列表
                 格式: {'node_id': int, 'dof': int, 'value': float}
                 dof: 0=x, 1=y, 2=z
             penalty_multiplier (float): 罚因子倍数，默认 1e9
@@ -44,46 +121,38 @@ class BoundaryConditionHandler:
         # 1. 计算自适应罚因子
         if is_sparse:
             max_diag = np.max(np.abs(K.diagonal()))
-            # 转换为 LIL 格式以便修改
-            K_mod = K.tolil()
+            K_mod = K
         else:
             max_diag = np.max(np.abs(np.diag(K)))
             K_mod = K.copy()
         
-        alpha = max_diag * penalty_multiplier
+        alpha = BoundaryConditionHandler._penalty_factor(max_diag, penalty_multiplier)
         F_mod = F_or_R.copy()
         
-        # 2. 应用约束
-        for cons in constraints:
-            node_id = cons['node_id']
-            dof = cons['dof']
-            val = cons.get('value', 0.0)
-            
-            # 计算全局自由度索引
-            # 假设节点 ID 从 1 开始
-            row_idx = (node_id - 1) * 3 + dof
-            
-            # 边界检查
-            if row_idx >= K.shape[0]:
-                raise ValueError(
-                    f"Constraint out of bounds: Node {node_id} DOF {dof} "
-                    f"(index {row_idx} >= matrix size {K.shape[0]})"
-                )
-            
-            # 修改刚度矩阵对角元素
-            K_mod[row_idx, row_idx] += alpha
-            
-            # 修改载荷/残差向量
-            F_mod[row_idx] += alpha * val
+        # 2. 应用约束 (向量化)
+        # 假设节点 ID 从 1 开始
+        cons = ConstraintArray.from_dict_list(constraints)
+        row_idx = cons.dof_indices()
         
-        # 3. 转换回原格式
-        if is_sparse:
-            K_mod = K_mod.tocsr()
+        # 边界检查
+        out_of_bounds = row_idx >= K.shape[0]
+        if np.any(out_of_bounds):
+            i = int(np.argmax(out_of_bounds))
+            raise ValueError(
+                f"Constraint out of bounds: Node {cons.node_ids[i]} DOF {cons.dofs[i]} "
+                f"(index {row_idx[i]} >= matrix size {K.shape[0]})"
+            )
+        
+        # 修改刚度矩阵对角元素与载荷/残差向量
+        # 重复约束的自由度按出现次数累加，与逐条 += 的语义一致
+        K_mod = BoundaryConditionHandler._add_to_diagonal(K_mod, row_idx, alpha, is_sparse)
+        np.add.at(F_mod, row_idx, alpha * cons.values)
         
         return K_mod, F_mod
     
     @staticmethod
-    def apply_penalty_for_residual(K, R, constraints, penalty_multiplier=1e9, is_sparse=True):
+    def apply_penalty_for_residual(K, R, constraints, penalty_multiplier=1e9, is_sparse=True,
+                                   diag_pos=None):
         """
         对残差方程应用罚函数法边界条件（非线性求解器专用）
         
@@ -98,41 +167,101 @@ class BoundaryConditionHandler:
         Args:
             K: 切线刚度矩阵 (scipy.sparse matrix)
             R: 残差向量 (numpy array)
-            constraints: 约束列表
+            constraints: 约束列表 (list of dict 或 ConstraintArray)
             penalty_multiplier: 罚因子倍数
             is_sparse: K 是否为稀疏矩阵
+            diag_pos: 可选，csr_diagonal_positions(K) 的结果。提供时直接在
+                K.data 上原地累加罚因子 (K 会被修改)，省去稀疏矩阵加法与格式转换
         
         Returns:
             K_modified, R_modified
         """
+        if is_sparse and diag_pos is not None:
+            cons = ConstraintArray.from_dict_list(constraints)
+            row_idx = cons.dof_indices()
+            row_idx = row_idx[row_idx < K.shape[0]]
+            pos = diag_pos[row_idx]
+            if np.all(pos >= 0):
+                diag = K.data[diag_pos[diag_pos >= 0]]
+                max_diag = np.max(np.abs(diag)) if diag.size else 0.0
+                alpha = BoundaryConditionHandler._penalty_factor(max_diag, penalty_multiplier)
+                R_mod = R.copy()
+                R_mod[row_idx] = 0.0
+                np.add.at(K.data, pos, alpha)
+                return K, R_mod
+            # 稀疏结构中缺少部分对角元，退回通用路径
+        
         if is_sparse:
             max_diag = np.max(np.abs(K.diagonal()))
-            K_mod = K.tolil()
+            K_mod = K
         else:
             max_diag = np.max(np.abs(np.diag(K)))
             K_mod = K.copy()
         
-        alpha = max_diag * penalty_multiplier
+        alpha = BoundaryConditionHandler._penalty_factor(max_diag, penalty_multiplier)
         R_mod = R.copy()
         
-        for cons in constraints:
-            node_id = cons['node_id']
-            dof = cons['dof']
-            
-            row_idx = (node_id - 1) * 3 + dof
-            
-            if row_idx >= K.shape[0]:
-                continue
-            
-            # 关键区别：残差设为 0，而不是加上 alpha * val
-            R_mod[row_idx] = 0.0
-            K_mod[row_idx, row_idx] += alpha
+        cons = ConstraintArray.from_dict_list(constraints)
+        row_idx = cons.dof_indices()
+        row_idx = row_idx[row_idx < K.shape[0]]
         
-        if is_sparse:
-            K_mod = K_mod.tocsr()
+        # 关键区别：残差设为 0，而不是加上 alpha * val
+        R_mod[row_idx] = 0.0
+        K_mod = BoundaryConditionHandler._add_to_diagonal(K_mod, row_idx, alpha, is_sparse)
         
         return K_mod, R_mod
     
+    @staticmethod
+    def _penalty_factor(max_diag, penalty_multiplier):
+        """
+        自适应罚因子 α = max_diag * penalty_multiplier
+        
+        对角元全为 0 (未初始化或退化的 K) 时 α 会变成 0，罚函数失效并导致
+        后续求解失败，此时发出警告并直接使用 penalty_multiplier。
+        """
+        if max_diag == 0.0:
+            warnings.warn("K has zero diagonal; using raw penalty multiplier", RuntimeWarning)
+            return float(penalty_multiplier)
+        return max_diag * penalty_multiplier
+    
+    @staticmethod
+    def csr_diagonal_positions(K):
+        """
+        计算 CSR 矩阵每一行对角元在 K.data 中的位置
+        
+        同一网格的稀疏结构在整个分析中不变，结果可以缓存复用，
+        之后对角元修改只需 K.data[diag_pos[idx]] += α。
+        
+        Args:
+            K: scipy.sparse.csr_matrix (不含重复项)
+        
+        Returns:
+            np.ndarray (n,): 对角元位置，结构中不存在的对角元为 -1
+        """
+        n = K.shape[0]
+        rows = np.repeat(np.arange(n), np.diff(K.indptr))
+        on_diag = np.flatnonzero(K.indices == rows)
+        diag_pos = np.full(n, -1, dtype=np.int64)
+        diag_pos[rows[on_diag]] = on_diag
+        return diag_pos
+    
+    @staticmethod
+    def _add_to_diagonal(K, row_idx, alpha, is_sparse):
+        """
+        K[i,i] += alpha (对 row_idx 中每个索引，重复索引累加)
+        
+        稀疏矩阵通过叠加一个对角 COO 矩阵完成，避免 LIL 逐元素修改；
+        稠密矩阵原地修改 (调用方已负责拷贝)。
+        """
+        if is_sparse:
+            n = K.shape[0]
+            penalty = sp.coo_matrix(
+                (np.full(len(row_idx), alpha), (row_idx, row_idx)), shape=(n, n)
+            )
+            return (K + penalty).tocsr()
+        np.add.at(K, (row_idx, row_idx), alpha)
+        return K
+    
     @staticmethod
     def validate_constraints(constraints, num_nodes):
         """
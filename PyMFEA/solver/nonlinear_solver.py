@@ -2,7 +2,8 @@ import numpy as np
 import time
 from scipy.sparse import coo_matrix
 from scipy.sparse.linalg import spsolve
-from solver.assembler import GlobalAssembler
+from solver.assembler import GlobalAssembler, for_each_element
+from solver.boundary_conditions import BoundaryConditionHandler, ConstraintArray
 
 class NonlinearSolver:
     """
@@ -21,7 +22,9 @@ class NonlinearSolver:
             num_nodes: 节点总数
             constraints: 约束列表 (已展开为节点ID)
             loads_data: 载荷列表 (已展开为节点ID)
-            config: 配置字典 (total_time, initial_dt, max_iter, tolerance)
+            config: 配置字典 (total_time, initial_dt, max_iter, tolerance, verbose, n_workers)
+                verbose: 0 静默 (不格式化任何日志)，1 迭代表格 (默认)，2 额外输出组装信息
+                n_workers: 单元组装与应力恢复的并行线程数，默认 1 (串行)
         """
         self.elements = elements
         self.num_nodes = num_nodes
@@ -31,6 +34,22 @@ class NonlinearSolver:
         self.constraints = constraints
         self.loads_data = loads_data
         
+        # 一次性转换为列式数组 (SoA)，迭代中直接向量化使用
+        self._cons = ConstraintArray.from_dict_list(constraints)
+        self._loads = ConstraintArray.from_dict_list(loads_data)
+        load_idx = self._loads.dof_indices()
+        valid = (load_idx >= 0) & (load_idx < self.num_dofs)
+        self._load_idx = load_idx[valid]
+        self._load_vals = self._loads.values[valid]
+        cons_idx = self._cons.dof_indices()
+        self._cons_idx = cons_idx[cons_idx < self.num_dofs]
+        
+        # 需要提交积分点状态的单元只筛选一次，避免每个增量步逐个 hasattr 探测
+        self._stateful_elems = [e for e in elements if hasattr(e, 'commit_state')]
+        
+        # 切线刚度对角元在 K.data 中的位置 (每个增量步由该步首次组装的矩阵计算)
+        self._diag_pos = None
+        
         # 配置 (针对塑性问题优化的默认值)
         self.config = config or {
             "total_time": 1.0, 
@@ -38,6 +57,9 @@ class NonlinearSolver:
             "max_iter": 30,       # 增加迭代次数
             "tolerance": 1e-4     # 适中的容差
         }
+        # 日志级别：热循环中先判断再格式化字符串
+        self._verbose = int(self.config.get("verbose", 1))
+        self._n_workers = int(self.config.get("n_workers", 1))
         
         # 状态量 (当前收敛的总位移)
         self.u_current = np.zeros(self.num_dofs)
@@ -59,24 +81,19 @@ class NonlinearSolver:
     def _build_load_vector(self, factor):
         """构建当前时间步的外力向量 F_ext = Load * factor"""
         F_ext = np.zeros(self.num_dofs)
-        
-        for load in self.loads_data:
-            # 假设输入数据的 node_id 是 1-based
-            nid = load['node_id']
-            dof = load['dof']
-            val = load['value']
-            
-            # 映射到矩阵索引 (0-based)
-            idx = (nid - 1) * 3 + dof
-            if 0 <= idx < self.num_dofs:
-                F_ext[idx] += val * factor
+        # 假设输入数据的 node_id 是 1-based，越界条目已在构造时剔除
+        np.add.at(F_ext, self._load_idx, self._load_vals * factor)
         return F_ext
 
-    def _line_search(self, u_base, du, target_load, assembler, res_norm_old, max_ls_iter=5):
+    def _line_search(self, u_base, du, target_load, assembler, res_norm_old):
         """
-        回溯线搜索 (Backtracking Line Search)
+        一次二次插值线搜索 (Quadratic Interpolation Line Search)
         
-        寻找步长 α 使得 ||R(u + α*du)|| < ||R(u)||
+        以 φ(α) = ½||R(u + α*du)||² 为价值函数。对 Newton 方向有
+        φ'(0) = -||R(u)||² = -2φ(0)。先试探 α = 1；不满足 Armijo 条件时，
+        由 φ(0)、φ'(0)、φ(1) 拟合抛物线，取其极小点
+        α_q = -φ'(0) / (2(φ(1) - φ(0) - φ'(0)))，截断到 [0.1, 1] 再试探一次
+        (Nocedal & Wright §3.5)；仍不满足时做一次二分回退。最多 3 次内力计算。
         
         Args:
             u_base: 当前位移
@@ -84,55 +101,58 @@ class NonlinearSolver:
             target_load: 目标载荷向量
             assembler: 全局组装器
             res_norm_old: 当前残差范数
-            max_ls_iter: 最大线搜索迭代次数
             
         Returns:
-            alpha: 最优步长 (0 < α <= 1)
+            alpha: 采用的步长 (0 < α <= 1)
             res_norm_new: 新残差范数
-            success: 是否成功降低残差
+            success: 是否满足 Armijo 条件
         """
-        alpha = 1.0
-        beta = 0.5  # 步长缩减因子
         c = 1e-4    # Armijo 条件参数
         
-        for ls_iter in range(max_ls_iter):
-            # 试探新位移
-            u_trial = u_base + alpha * du
-            
-            # 重新计算内力
-            def compute_element(elem, u_current):
-                return elem.compute_element(u_current)
-            
-            K_new, F_int_new, failed = assembler.assemble_generic(
-                compute_element, 
-                u_current=u_trial
+        phi0 = 0.5 * res_norm_old**2
+        dphi0 = -res_norm_old**2
+        
+        # 线搜索只需残差，不组装切线刚度
+        def compute_internal_force(elem, u_current):
+            return elem.compute_internal_force(u_current)
+        
+        def residual_norm(alpha):
+            """||R(u + α du)||，单元失效时返回 None"""
+            F_int_new, failed = assembler.assemble_internal_force(
+                compute_internal_force, 
+                u_current=u_base + alpha * du
             )
-            
             if failed:
-                alpha *= beta
-                continue
-            
-            # 计算新残差
+                return None
             R_new = target_load - F_int_new
-            
-            # 边界条件处理
-            from solver.boundary_conditions import BoundaryConditionHandler
-            _, R_new = BoundaryConditionHandler.apply_penalty_for_residual(
-                K_new, R_new, self.constraints, 
-                penalty_multiplier=1e9, is_sparse=True
-            )
-            
-            res_norm_new = np.linalg.norm(R_new)
-            
-            # Armijo 条件: 残差是否足够减小
-            if res_norm_new < res_norm_old * (1 - c * alpha):
-                return alpha, res_norm_new, True
-            
-            # 缩小步长继续搜索
-            alpha *= beta
+            # 边界条件处理：约束自由度残差置零 (K 不参与，无需罚函数修改)
+            R_new[self._cons_idx] = 0.0
+            return np.linalg.norm(R_new)
+        
+        def armijo(alpha, res_norm_new):
+            return res_norm_new is not None and res_norm_new < res_norm_old * (1 - c * alpha)
+        
+        # 1. 完整 Newton 步
+        res_1 = residual_norm(1.0)
+        if armijo(1.0, res_1):
+            return 1.0, res_1, True
+        
+        # 2. 二次插值步 (α = 1 处单元失效时无法拟合，直接取二分步长)
+        alpha = 0.5
+        if res_1 is not None:
+            curv = 0.5 * res_1**2 - phi0 - dphi0
+            if curv > 0.0:
+                alpha = min(max(-dphi0 / (2.0 * curv), 0.1), 1.0)
+        res_q = residual_norm(alpha)
+        if armijo(alpha, res_q):
+            return alpha, res_q, True
         
-        # 线搜索失败，返回最小步长
-        return alpha, res_norm_new, False
+        # 3. 一次二分回退
+        alpha *= 0.5
+        res_b = residual_norm(alpha)
+        if res_b is None:
+            res_b = np.inf
+        return alpha, res_b, armijo(alpha, res_b)
 
     def solve(self, progress_callback=None):
         # 1. 提取配置
@@ -145,10 +165,12 @@ class NonlinearSolver:
         min_dt = 1e-6
         
         # 创建全局组装器实例（复用线性求解器的组装逻辑）
-        assembler = GlobalAssembler(self.elements, self.num_nodes)
+        assembler = GlobalAssembler(self.elements, self.num_nodes, verbose=self._verbose >= 2,
+                                    n_workers=self._n_workers)
         
-        self.log_callback(f"{'TIME':<8} | {'dt':<8} | {'ITER':<5} | {'RESIDUAL':<12} | {'STATUS'}")
-        self.log_callback("-" * 65)
+        if self._verbose >= 1:
+            self.log_callback(f"{'TIME':<8} | {'dt':<8} | {'ITER':<5} | {'RESIDUAL':<12} | {'STATUS'}")
+            self.log_callback("-" * 65)
 
         # 2. 时间增量循环
         while current_time < end_time:
@@ -164,7 +186,8 @@ class NonlinearSolver:
             for iter_i in range(max_iter):
                 # === 检查中断请求 ===
                 if self.check_interrupt and self.check_interrupt():
-                    self.log_callback("\n*** Job terminated by user ***")
+                    if self._verbose >= 1:
+                        self.log_callback("\n*** Job terminated by user ***")
                     return self.u_current
                 
                 u_trial = self.u_current + du_accum
@@ -185,24 +208,28 @@ class NonlinearSolver:
                 )
                 
                 if assembly_failed:
-                    self.log_callback(f"{current_time:.4f} | {dt:.4f} | {iter_i} | -- | Element Bad")
+                    if self._verbose >= 1:
+                        self.log_callback(f"{current_time:.4f} | {dt:.4f} | {iter_i} | -- | Element Bad")
                     break
 
+                if iter_i == 0:
+                    # 步内稀疏结构不变；不能只比较 nnz，结构不同的矩阵 nnz 也可能相同
+                    self._diag_pos = BoundaryConditionHandler.csr_diagonal_positions(K_sys)
+
                 # --- B. 计算残差 ---
                 R = target_load - F_int_sys
                 
                 # --- C. 边界条件处理 (使用统一的 BoundaryConditionHandler) ---
-                from solver.boundary_conditions import BoundaryConditionHandler
-                
                 # 非线性迭代使用 apply_penalty_for_residual：
                 # - 残差 R[idx] = 0（约束自由度没有不平衡力）
                 # - 刚度 K[idx,idx] += α（确保 du[idx] ≈ 0）
                 K_sys, R = BoundaryConditionHandler.apply_penalty_for_residual(
                     K_sys,
                     R,
-                    self.constraints,
+                    self._cons,
                     penalty_multiplier=1e9,
-                    is_sparse=True
+                    is_sparse=True,
+                    diag_pos=self._diag_pos
                 )
 
                 # --- D. 收敛性检查 ---
@@ -220,21 +247,23 @@ class NonlinearSolver:
                     }
                     self.monitor_callback(monitor_data)
                 
-                # 格式化输出
+                # 格式化输出 (verbose=0 时跳过全部字符串格式化)
+                log_on = self._verbose >= 1
                 status_str = "..."
-                if iter_i == 0: 
+                if iter_i == 0 and log_on: 
                     self.log_callback(f"{current_time+dt:.4f}   | {dt:.4f}   | {iter_i:<5} | {res_norm:.4e}   | Start")
                 
                 if res_norm < tol:
                     converged = True
                     status_str = "Converged"
-                    self.log_callback(f"{current_time+dt:.4f}   | {dt:.4f}   | {iter_i:<5} | {res_norm:.4e}   | \033[92m{status_str}\033[0m")
+                    if log_on:
+                        self.log_callback(f"{current_time+dt:.4f}   | {dt:.4f}   | {iter_i:<5} | {res_norm:.4e}   | \033[92m{status_str}\033[0m")
                     # 发送收敛状态
                     if self.monitor_callback:
                         monitor_data['converged'] = True
                         self.monitor_callback(monitor_data)
                     break
-                else:
+                elif log_on:
                     self.log_callback(f"{current_time+dt:.4f}   | {dt:.4f}   | {iter_i:<5} | {res_norm:.4e}   | {status_str}")
 
                 # --- E. 稀疏线性求解 ---
@@ -242,24 +271,26 @@ class NonlinearSolver:
                     # 使用 scipy.sparse.linalg.spsolve
                     du = spsolve(K_sys, R)
                 except Exception as e:
-                    self.log_callback(f"Linear Solver Error: {str(e)}")
+                    if self._verbose >= 1:
+                        self.log_callback(f"Linear Solver Error: {str(e)}")
                     break
                 
                 # 发散保护
                 if np.max(np.abs(du)) > 1e6:
-                    self.log_callback("Divergence detected (large du)")
+                    if self._verbose >= 1:
+                        self.log_callback("Divergence detected (large du)")
                     break
                 
                 # --- F. 线搜索 (新增) ---
                 alpha, res_after_ls, ls_success = self._line_search(
-                    u_trial, du, target_load, assembler, res_norm, max_ls_iter=5
+                    u_trial, du, target_load, assembler, res_norm
                 )
                 
                 # 使用线搜索步长更新位移
                 du_accum += alpha * du
                 
                 # 如果线搜索失败且残差增大很多，考虑提前退出
-                if not ls_success and res_after_ls > res_norm * 2:
+                if not ls_success and res_after_ls > res_norm * 2 and self._verbose >= 1:
                     self.log_callback(f"  Line search failed, α={alpha:.3f}")
                 elif alpha < 1.0:
                     # 只在步长被缩减时输出
@@ -271,9 +302,8 @@ class NonlinearSolver:
                 current_time += dt
                 
                 # === 提交积分点状态 (塑性历史锁定) ===
-                for elem in self.elements:
-                    if hasattr(elem, 'commit_state'):
-                        elem.commit_state()
+                for elem in self._stateful_elems:
+                    elem.commit_state()
                 
                 if progress_callback:
                     progress_callback(int((current_time / end_time) * 100))
@@ -286,9 +316,11 @@ class NonlinearSolver:
             else:
                 dt *= 0.5
                 if dt < min_dt:
-                    self.log_callback("Step too small, aborting.")
+                    if self._verbose >= 1:
+                        self.log_callback("Step too small, aborting.")
                     break
-                self.log_callback(f">>> Cutback: dt = {dt:.4e}")
+                if self._verbose >= 1:
+                    self.log_callback(f">>> Cutback: dt = {dt:.4e}")
         
         return self.u_current
 
@@ -298,7 +330,7 @@ class NonlinearSolver:
         
         策略：
         1. 遍历每个单元，调用 elem.calculate_cauchy_stress(u_elem)
-        2. 将单元中心点应力平均分配给 8 个节点 (Accumulate & Average)
+        2. 将单元中心点应力平均分配给该单元的各个节点 (Accumulate & Average)
         3. 计算 Von Mises 应力
         
         Args:
@@ -308,38 +340,45 @@ class NonlinearSolver:
             stress_mises: Von Mises 应力 (num_nodes,)
             stress_components: 应力分量 (num_nodes, 6)
         """
-        # 初始化累加器: [σxx, σyy, σzz, τyz, τxz, τxy, count]
-        node_stress_accum = np.zeros((self.num_nodes, 7))
+        num_elem = len(self.elements)
+        elem_sigma = np.zeros((num_elem, 6))
+        elem_nodes = [None] * num_elem
         
-        for elem in self.elements:
+        def compute(e):
+            elem = self.elements[e]
             # 提取单元位移
             idx = elem.get_dof_indices()
             u_elem = U_global[idx]
             
             # 调用单元应力计算方法 (返回 Voigt 向量)
-            sigma_voigt = elem.calculate_cauchy_stress(u_elem)
-            
-            # 将应力分配给单元的 8 个节点
-            for node in elem.nodes:
-                # Node ID 是 1-based，转换为 0-based 索引
-                node_idx = node.id - 1
-                if 0 <= node_idx < self.num_nodes:
-                    node_stress_accum[node_idx, :6] += sigma_voigt
-                    node_stress_accum[node_idx, 6] += 1.0
+            elem_sigma[e] = elem.calculate_cauchy_stress(u_elem)
+            # Node ID 是 1-based，转换为 0-based 索引
+            elem_nodes[e] = np.array([node.id - 1 for node in elem.nodes], dtype=np.int64)
+            return False
+        
+        # 各单元只写入自己的行，n_workers > 1 时分块并行
+        for_each_element(num_elem, compute, self._n_workers)
+        
+        # 将单元应力一次性分配给各自的节点 (按各单元实际节点数展开，越界节点忽略)
+        nodes_per_elem = np.array([len(n) for n in elem_nodes], dtype=np.int64)
+        node_idx = np.concatenate(elem_nodes) if num_elem else np.zeros(0, dtype=np.int64)
+        sigma_rep = np.repeat(elem_sigma, nodes_per_elem, axis=0)
+        valid = (node_idx >= 0) & (node_idx < self.num_nodes)
+        node_idx, sigma_rep = node_idx[valid], sigma_rep[valid]
+        
+        # 累加器: [σxx, σyy, σzz, τyz, τxz, τxy] 与计数
+        node_stress_accum = np.zeros((self.num_nodes, 6))
+        np.add.at(node_stress_accum, node_idx, sigma_rep)
+        counts = np.bincount(node_idx, minlength=self.num_nodes).astype(float)
         
         # 平均化
-        counts = node_stress_accum[:, 6]
         counts[counts == 0] = 1.0  # 避免除零
-        stress_components = node_stress_accum[:, :6] / counts[:, np.newaxis]
+        stress_components = node_stress_accum / counts[:, np.newaxis]
         
         # 计算 Von Mises 应力
         # σ_vm = sqrt(σxx² + σyy² + σzz² - σxx*σyy - σyy*σzz - σzz*σxx + 3*(τxy² + τyz² + τxz²))
-        sxx = stress_components[:, 0]
-        syy = stress_components[:, 1]
-        szz = stress_components[:, 2]
-        tyz = stress_components[:, 3]
-        txz = stress_components[:, 4]
-        txy = stress_components[:, 5]
+        # 转置拷贝一次，使每个分量在内存中连续 (列切片是步长为 6 的非连续视图)
+        sxx, syy, szz, tyz, txz, txy = stress_components.T.copy()
         
         stress_mises = np.sqrt(
             sxx**2 + syy**2 + szz**2 
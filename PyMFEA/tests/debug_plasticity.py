@@ -57,8 +57,9 @@ print("=" * 60)
 
 print(f"弹性刚度矩阵 D 对角线: {np.diag(elastic.D)}")
 print(f"一致切线 D_tang 对角线: {np.diag(tangent)}")
-print(f"切线是否正定: {np.all(np.linalg.eigvals(tangent) > 0)}")
-print(f"切线最小特征值: {np.min(np.linalg.eigvals(tangent)):.2f}")
+tangent_eig = np.linalg.eigvalsh(tangent)  # 关联流动下切线对称
+print(f"切线是否正定: {np.all(tangent_eig > 0)}")
+print(f"切线最小特征值: {tangent_eig.min():.2f}")
 
 # === 测试3: 多次增量 ===
 print("\n" + "=" * 60)
@@ -0,0 +1,147 @@
+# 文件: PyMFEA/tests/test_assembler.py
+"""
+全局组装器单元测试
+"""
+
+import sys
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+import core.element as element_mod
+from core.element import C3D8Element
+from core.element_nonlinear import C3D8_TL, C3D8_UL
+from core.node import Node
+from core.materials import MaterialFactory
+from solver.assembler import GlobalAssembler, for_each_element
+
+
+def _make_mesh(n=2, jitter=0.0, seed=0):
+    """n×n×n 个单位立方体组成的网格，内部节点可随机扰动"""
+    rng = np.random.default_rng(seed)
+    nodes, grid = {}, {}
+    for k in range(n + 1):
+        for j in range(n + 1):
+            for i in range(n + 1):
+                nid = len(nodes) + 1
+                xyz = np.array([i, j, k], dtype=float)
+                if 0 < i < n and 0 < j < n and 0 < k < n:
+                    xyz += rng.uniform(-jitter, jitter, 3)
+                nodes[nid] = Node(nid, *xyz)
+                grid[(i, j, k)] = nid
+    conn = []
+    for k in range(n):
+        for j in range(n):
+            for i in range(n):
+                conn.append([grid[(i, j, k)], grid[(i + 1, j, k)], grid[(i + 1, j + 1, k)],
+                             grid[(i, j + 1, k)], grid[(i, j, k + 1)], grid[(i + 1, j, k + 1)],
+                             grid[(i + 1, j + 1, k + 1)], grid[(i, j + 1, k + 1)]])
+    return nodes, conn
+
+
+def _linear_elements(nodes, conn):
+    mat = MaterialFactory.create_elastic(E=70000.0, nu=0.3)
+    return [C3D8Element(e + 1, [nodes[i] for i in c], mat) for e, c in enumerate(conn)]
+
+
+class TestParallelAssembly:
+    """测试批量/并行单元计算"""
+
+    @pytest.mark.skipif(not element_mod.NUMBA_AVAILABLE, reason="需要 Numba")
+    def test_ke_batch_matches_loop(self, monkeypatch):
+        """并行 Ke 内核与逐单元 calc_Ke 一致"""
+        monkeypatch.setattr(element_mod, 'NUMBA_MIN_ELEMS', 1)
+        nodes, conn = _make_mesh(n=3, jitter=0.2)
+        elems = _linear_elements(nodes, conn)
+        Ke_all = C3D8Element.calc_Ke_batch(elems)
+        for e, elem in enumerate(elems):
+            assert np.allclose(Ke_all[e], elem.calc_Ke(), rtol=1e-12, atol=1e-9)
+
+    def test_linear_assemble_matches_generic(self):
+        """批量线性组装与通用组装得到相同的 K"""
+        nodes, conn = _make_mesh(n=2, jitter=0.2)
+        assembler = GlobalAssembler(_linear_elements(nodes, conn), len(nodes), verbose=False)
+        K = assembler.assemble()
+        K_ref, _, _ = assembler.assemble_generic(lambda elem, u: (elem.calc_Ke(), None, False))
+        assert np.allclose(K.toarray(), K_ref.toarray(), rtol=1e-12, atol=1e-9)
+
+    def test_threaded_matches_serial(self):
+        """n_workers > 1 时的分块并行组装与串行结果一致，失败单元被报告"""
+        nodes, conn = _make_mesh(n=2, jitter=0.2)
+        elems = _linear_elements(nodes, conn)
+        u = np.linspace(0.0, 1e-3, len(nodes) * 3)
+
+        def routine(elem, u_current):
+            Ke = elem.calc_Ke()
+            return Ke, Ke @ u_current[elem.get_dof_indices()], False
+
+        K1, F1, _ = GlobalAssembler(elems, len(nodes), verbose=False).assemble_generic(routine, u)
+        K3, F3, failed = GlobalAssembler(elems, len(nodes), verbose=False,
+                                         n_workers=3).assemble_generic(routine, u)
+        assert not failed
+        assert np.array_equal(K1.toarray(), K3.toarray())
+        assert np.array_equal(F1, F3)
+        assert for_each_element(10, lambda e: e == 7, n_workers=3)
+
+
+class TestPatternCache:
+    """测试拓扑索引缓存的失效"""
+
+    def test_rebuilt_when_elements_change(self):
+        """单元列表被替换或原地增删后重新组装，结果与新建组装器一致"""
+        nodes, conn = _make_mesh(n=2, jitter=0.2)
+        elems = _linear_elements(nodes, conn)
+        subset = elems[:3]
+        assembler = GlobalAssembler(subset, len(nodes), verbose=False)
+        K_sub = assembler.assemble()
+        rows_before, _ = assembler._coo_pattern()
+
+        # 原地追加单元
+        subset.extend(elems[3:6])
+        K_grown = assembler.assemble()
+        K_ref = GlobalAssembler(elems[:6], len(nodes), verbose=False).assemble()
+        assert len(assembler._coo_pattern()[0]) == 6 * 576 != len(rows_before)
+        assert np.allclose(K_grown.toarray(), K_ref.toarray())
+        assert not np.allclose(K_grown.toarray(), K_sub.toarray())
+
+        # 替换为等长但不同的单元序列
+        assembler.elements = elems[2:8]
+        K_swapped = assembler.assemble()
+        K_ref = GlobalAssembler(elems[2:8], len(nodes), verbose=False).assemble()
+        assert np.allclose(K_swapped.toarray(), K_ref.toarray())
+
+        # 单元不变时复用缓存
+        dof_map = assembler._dof_map()
+        assembler.assemble()
+        assert assembler._dof_map() is dof_map
+
+
+class TestInternalForce:
+    """测试线搜索使用的仅内力路径"""
+
+    @pytest.mark.parametrize("elem_cls", [C3D8_TL, C3D8_UL])
+    def test_matches_full_computation(self, elem_cls):
+        """compute_internal_force / assemble_internal_force 与完整计算的内力部分一致"""
+        nodes, conn = _make_mesh(n=2, jitter=0.1)
+        mat = MaterialFactory.create_j2_plastic(E=70000.0, nu=0.3, yield_stress=250.0, hardening=1000.0)
+        elems = [elem_cls(e + 1, [nodes[i] for i in c], mat) for e, c in enumerate(conn)]
+        coords = np.array([nodes[i].coords for i in sorted(nodes)])
+        u = (0.004 * coords * coords[:, [1, 2, 0]]).ravel()  # 非零、非均匀的位移场
+
+        for elem in elems:
+            _, Fe_full, failed = elem.compute_element(u)
+            Fe, failed_force = elem.compute_internal_force(u)
+            assert not failed and not failed_force
+            assert np.allclose(Fe, Fe_full, rtol=1e-12, atol=1e-12)
+
+        assembler = GlobalAssembler(elems, len(nodes), verbose=False)
+        _, F_full, _ = assembler.assemble_generic(lambda elem, u_cur: elem.compute_element(u_cur), u)
+        F_int, failed = assembler.assemble_internal_force(
+            lambda elem, u_cur: elem.compute_internal_force(u_cur), u)
+        assert not failed
+        assert np.linalg.norm(F_full) > 0.0
+        assert np.allclose(F_int, F_full, rtol=1e-12, atol=1e-12)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,130 @@
+# 文件: PyMFEA/tests/test_boundary_conditions.py
+"""
+边界条件处理单元测试
+"""
+
+import sys
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from solver.boundary_conditions import BoundaryConditionHandler, ConstraintArray
+
+
+def _make_system(n_nodes=4):
+    """构造一个对角占优的小型稀疏系统"""
+    n = n_nodes * 3
+    K = sp.diags([np.full(n - 1, -1.0), np.full(n, 4.0), np.full(n - 1, -1.0)], [-1, 0, 1]).tocsr()
+    F = np.arange(n, dtype=float)
+    return K, F
+
+
+class TestConstraintArray:
+    """测试约束列式存储"""
+
+    def test_from_dict_list(self):
+        """测试字典列表转换"""
+        cons = ConstraintArray.from_dict_list([
+            {'node_id': 2, 'dof': 1, 'value': 0.5},
+            {'node_id': 3, 'dof': 2},
+        ])
+        assert len(cons) == 2
+        assert np.array_equal(cons.node_ids, [2, 3])
+        assert np.array_equal(cons.values, [0.5, 0.0])
+        assert np.array_equal(cons.dof_indices(), [4, 8])
+
+    def test_passthrough(self):
+        """已是 ConstraintArray 时原样返回"""
+        cons = ConstraintArray.from_dict_list([{'node_id': 1, 'dof': 0, 'value': 0.0}])
+        assert ConstraintArray.from_dict_list(cons) is cons
+
+    def test_expand_sets(self):
+        """集合约束按 节点 × 自由度 展开，未定义的集合被忽略"""
+        cons = ConstraintArray.expand_sets([
+            {'node_id': 5, 'dof': 2, 'value': 0.1},
+            {'set_name': 'FIX', 'dofs': np.array([0, 2]), 'value': 0.0},
+            {'set_name': 'MISSING', 'dofs': np.array([1]), 'value': 0.0},
+        ], {'FIX': [1, 3]})
+        assert np.array_equal(cons.node_ids, [5, 1, 3, 1, 3])
+        assert np.array_equal(cons.dofs, [2, 0, 0, 2, 2])
+        assert np.array_equal(cons.values, [0.1, 0.0, 0.0, 0.0, 0.0])
+
+
+class TestPenaltyMethod:
+    """测试罚函数法"""
+
+    def test_penalty_matches_loop(self):
+        """向量化结果应与逐条修改一致 (含重复约束)"""
+        K, F = _make_system()
+        constraints = [
+            {'node_id': 1, 'dof': 0, 'value': 0.1},
+            {'node_id': 1, 'dof': 0, 'value': 0.1},
+            {'node_id': 4, 'dof': 2, 'value': -0.2},
+        ]
+        K_mod, F_mod = BoundaryConditionHandler.apply_penalty_method(
+            K, F, constraints, penalty_multiplier=1e3
+        )
+
+        alpha = 4.0 * 1e3
+        K_ref = K.toarray()
+        F_ref = F.copy()
+        for c in constraints:
+            i = (c['node_id'] - 1) * 3 + c['dof']
+            K_ref[i, i] += alpha
+            F_ref[i] += alpha * c['value']
+
+        assert sp.issparse(K_mod)
+        assert np.allclose(K_mod.toarray(), K_ref)
+        assert np.allclose(F_mod, F_ref)
+
+    def test_out_of_bounds(self):
+        """约束超出矩阵范围时报错"""
+        K, F = _make_system()
+        with pytest.raises(ValueError):
+            BoundaryConditionHandler.apply_penalty_method(
+                K, F, [{'node_id': 10, 'dof': 0, 'value': 0.0}]
+            )
+
+    def test_zero_diagonal_fallback(self):
+        """K 对角全为 0 时发出警告并使用原始罚因子"""
+        K = sp.csr_matrix((6, 6))
+        F = np.zeros(6)
+        with pytest.warns(RuntimeWarning):
+            K_mod, _ = BoundaryConditionHandler.apply_penalty_method(
+                K, F, [{'node_id': 1, 'dof': 1, 'value': 0.0}], penalty_multiplier=1e3
+            )
+        assert K_mod[1, 1] == 1e3
+
+    def test_residual_zeroed(self):
+        """残差版本：约束自由度残差置零，越界约束忽略"""
+        K, R = _make_system()
+        cons = ConstraintArray.from_dict_list([
+            {'node_id': 2, 'dof': 1},
+            {'node_id': 10, 'dof': 0},
+        ])
+        K_mod, R_mod = BoundaryConditionHandler.apply_penalty_for_residual(
+            K, R, cons, penalty_multiplier=1e3
+        )
+        assert R_mod[4] == 0.0
+        assert R[4] == 4.0  # 输入不被修改
+        assert np.isclose(K_mod[4, 4], 4.0 + 4.0 * 1e3)
+
+    def test_residual_diag_pos_inplace(self):
+        """缓存对角元位置的原地路径与通用路径结果一致"""
+        K, R = _make_system()
+        cons = [{'node_id': 1, 'dof': 0}, {'node_id': 3, 'dof': 2}]
+        K_ref, R_ref = BoundaryConditionHandler.apply_penalty_for_residual(K, R, cons)
+
+        diag_pos = BoundaryConditionHandler.csr_diagonal_positions(K)
+        assert np.array_equal(K.data[diag_pos], K.diagonal())
+        K_mod, R_mod = BoundaryConditionHandler.apply_penalty_for_residual(
+            K, R, cons, diag_pos=diag_pos
+        )
+        assert K_mod is K
+        assert np.allclose(K_mod.toarray(), K_ref.toarray())
+        assert np.array_equal(R_mod, R_ref)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,73 @@
+# 文件: PyMFEA/tests/test_element_nonlinear.py
+"""
+几何非线性单元单元测试
+"""
+
+import sys
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+from core.element_nonlinear import C3D8_TL, C3D8_UL
+from core.node import Node
+from core.materials import MaterialFactory
+
+
+def _unit_cube(elem_cls):
+    """单个 J2 塑性单位立方体单元"""
+    corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+               (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+    nodes = [Node(i + 1, *xyz) for i, xyz in enumerate(corners)]
+    mat = MaterialFactory.create_j2_plastic(E=70000.0, nu=0.3, yield_stress=250.0, hardening=1000.0)
+    return elem_cls(1, nodes, mat), np.array(corners, dtype=float)
+
+
+def _update_in_place(material):
+    """让材料像部分本构实现那样原地更新传入的状态 (而不是返回新对象)"""
+    compute_stress = material.compute_stress
+
+    def wrapped(F, state=None, dt=1.0):
+        result = compute_stress(F, state=state, dt=dt)
+        if state is not None:
+            state.stress[:] = result.state.stress
+            state.equivalent_plastic_strain = result.state.equivalent_plastic_strain
+            result.state = state
+        return result
+
+    material.compute_stress = wrapped
+
+
+def _snapshot(states):
+    return [(s.stress.copy(), s.equivalent_plastic_strain, s.plastic_strain.copy(), s.back_stress.copy())
+            for s in states]
+
+
+class TestStateCommit:
+    """测试积分点状态的提交"""
+
+    @pytest.mark.parametrize("elem_cls", [C3D8_TL, C3D8_UL])
+    def test_trial_does_not_touch_committed(self, elem_cls):
+        """commit_state 只交接引用：之后的试探迭代 (即使材料原地更新状态) 不得修改已提交的状态"""
+        elem, coords = _unit_cube(elem_cls)
+        _update_in_place(elem.material)
+        stretch = np.zeros_like(coords)
+
+        stretch[:, 2] = 0.01 * coords[:, 2]  # 超过屈服应变 250/70000
+        _, _, failed = elem.compute_element(stretch.ravel())
+        assert not failed
+        elem.commit_state()
+        committed = _snapshot(elem.gp_states_committed)
+        assert all(eps > 0.0 for _, eps, _, _ in committed)
+
+        stretch[:, 2] = 0.03 * coords[:, 2]
+        elem.compute_element(stretch.ravel())
+        elem.compute_internal_force(stretch.ravel())
+
+        assert all(c is not t for c, t in zip(elem.gp_states_committed, elem.gp_states_current))
+        for before, after in zip(committed, _snapshot(elem.gp_states_committed)):
+            for a, b in zip(before, after):
+                assert np.array_equal(a, b)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,168 @@
+# 文件: PyMFEA/tests/test_inp_reader.py
+"""
+INP 解析器单元测试
+"""
+
+import sys
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+import utils.inp_reader as inp_reader
+from utils.inp_reader import InpParser
+
+
+INP_TEXT = """** 单个 C3D8 单元
+*Heading
+*System
+10.0, 0.0, 0.0
+*Node
+1, 0., 0., 0.
+2, 1., 0., 0.
+3, 1., 1., 0.
+4, 0., 1., 0.
+5, 0., 0., 1.
+6, 1., 0., 1.
+7, 1., 1., 1.
+8, 0., 1., 1.
+*Element, type=C3D8
+1, 1, 2, 3, 4, 5, 6, 7, 8
+*Nset, nset=Bottom
+1, 2, 3, 4,
+*Nset, nset=All, generate
+1, 8, 1
+*Elset, elset=Eall
+1
+*Surface, type=ELEMENT, name=Top
+Eall, S2
+*Material, name=Steel
+*Elastic
+210000., 0.3
+*Density
+7.85e-09,
+*Plastic
+250., 0.
+*Boundary
+Bottom, ENCASTRE
+5, 1, 2, 0.01
+*Cload
+7, 3, -10.
+*Dsload
+Top, P, 2.0
+*Node Output
+U
+"""
+
+
+def _parse(tmp_path, text=INP_TEXT):
+    path = tmp_path / "model.inp"
+    path.write_text(text)
+    return InpParser().read(str(path))
+
+
+class TestInpParser:
+    """测试 INP 关键字解析"""
+
+    def test_mesh(self, tmp_path):
+        """节点坐标应用 *SYSTEM 原点偏移，单元拓扑完整"""
+        parsed = _parse(tmp_path)
+        assert len(parsed['nodes']) == 8
+        assert parsed['nodes'][7] == [11.0, 1.0, 1.0]
+        assert parsed['elements'][1] == [1, 2, 3, 4, 5, 6, 7, 8]
+
+    def test_irregular_blocks(self, tmp_path):
+        """不规整的数据块 (缺列、尾逗号) 退回逐行解析"""
+        path = tmp_path / "ragged.inp"
+        path.write_text(
+            "*Node\n1, 0., 0., 0.\n2, 1., 0.\n3, 1., 1., 0.\n"
+            "*Element, type=C3D4\n1, 1, 2, 3,\n2, 1, 3, 0, 2\n"
+        )
+        parser = InpParser()
+        data = parser.read(str(path))
+        assert sorted(data['nodes']) == [1, 3]
+        assert data['elements'] == {1: [1, 2, 3], 2: [1, 3, 2]}
+        assert np.array_equal(parser.elem_ids, [1, 2])
+        assert np.array_equal(parser.node_coords[parser._nrow[3]], [1.0, 1.0, 0.0])
+
+    def test_system_origin(self, tmp_path):
+        """*SYSTEM 缺省坐标补 0，P2 忽略，无数据行时恢复全局坐标系"""
+        parsed = _parse(tmp_path, "*System\n5.0, 2.0\n*Node\n1, 0., 0., 0.\n"
+                                  "*System\n1., 1., 1., 2., 1., 1.\n*Node\n2, 1., 0., 0.\n"
+                                  "*System\n*Node\n3, 1., 1., 1.\n")
+        assert parsed['nodes'][1] == [5.0, 2.0, 0.0]
+        assert parsed['nodes'][2] == [2.0, 1.0, 1.0]
+        assert parsed['nodes'][3] == [1.0, 1.0, 1.0]
+
+    def test_indented_keyword(self, tmp_path):
+        """缩进的关键字行同样结束上一个数据块"""
+        parsed = _parse(tmp_path, INP_TEXT.replace('*Element', '  *Element')
+                                          .replace('*Nset, nset=Bottom', '\t*Nset, nset=Bottom'))
+        assert len(parsed['nodes']) == 8
+        assert parsed['elements'][1] == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert list(parsed['nsets']['BOTTOM']) == [1, 2, 3, 4]
+
+    def test_sets(self, tmp_path):
+        """集合名统一大写，支持 GENERATE，ID 以 int64 数组存储"""
+        parsed = _parse(tmp_path)
+        assert list(parsed['nsets']['BOTTOM']) == [1, 2, 3, 4]
+        assert parsed['nsets']['ALL'].dtype == np.int64
+        assert list(parsed['nsets']['ALL']) == list(range(1, 9))
+        assert list(parsed['elsets']['EALL']) == [1]
+        assert list(parsed['surfaces']['TOP']) == [('EALL', 'S2')]
+
+    def test_keyword_params(self):
+        """关键字参数一次解析为字典，GENERATE 按参数名而非子串判断"""
+        params = InpParser._parse_params('*NSET, NSET= FIX , GENERATE')
+        assert params == {'NSET': 'FIX', 'GENERATE': None}
+        params = InpParser._parse_params('*NSET, NSET=GENERATED')
+        assert 'GENERATE' not in params
+
+    def test_materials(self, tmp_path):
+        """材料参数"""
+        parsed = _parse(tmp_path)
+        mat = parsed['materials']['STEEL']
+        assert mat['E'] == 210000.0
+        assert mat['nu'] == 0.3
+        assert mat['density'] == 7.85e-09
+        assert mat['plastic']['yield_stress'] == 250.0
+
+    def test_boundary(self, tmp_path):
+        """集合约束每行一条 (set_name + dofs)，节点约束逐自由度展开"""
+        parsed = _parse(tmp_path)
+        cons = parsed['constraints']
+        set_cons = [c for c in cons if c.get('set_name') == 'BOTTOM']
+        assert len(set_cons) == 1
+        assert list(set_cons[0]['dofs']) == [0, 1, 2, 3, 4, 5]
+        node_cons = [c for c in cons if c.get('node_id') == 5]
+        assert [(c['dof'], c['value']) for c in node_cons] == [(0, 0.01), (1, 0.01)]
+
+    def test_loads(self, tmp_path):
+        """集中力与压力等效节点力"""
+        parsed = _parse(tmp_path)
+        loads = parsed['loads']
+        assert {'node_id': 7, 'dof': 2, 'value': -10.0} in loads
+        assert any(l.get('surface_name') == 'TOP' for l in loads)
+
+        # 顶面 (法向 +z) 受压 p=2，总力 -p*A = -2，均分到 4 个节点
+        pressure = parsed['point_loads']
+        assert sorted(pressure['node_ids']) == [5, 6, 7, 8]
+        assert np.all(pressure['dofs'] == 2)
+        assert np.isclose(pressure['values'].sum(), -2.0)
+
+    @pytest.mark.skipif(not inp_reader.NUMBA_AVAILABLE, reason="numba 未安装")
+    def test_pressure_kernel_matches_numpy(self, monkeypatch):
+        """Numba 融合内核与 NumPy 批量计算结果一致"""
+        rng = np.random.default_rng(0)
+        parser = InpParser()
+        parser.node_coords = rng.random((50, 3))
+        face_rows = rng.integers(0, 50, (200, 4))
+
+        monkeypatch.setattr(inp_reader, 'NUMBA_MIN_FACES', 10**9)
+        ref = parser._face_node_forces(face_rows, 2.5)
+        monkeypatch.setattr(inp_reader, 'NUMBA_MIN_FACES', 1)
+        out = parser._face_node_forces(face_rows, 2.5)
+        assert np.allclose(out, ref)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
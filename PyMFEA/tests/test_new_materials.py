@@ -34,7 +34,8 @@ class TestIsotropicElastic:
     def test_elastic_matrix_positive_definite(self):
         """测试弹性矩阵正定性"""
         elastic = IsotropicElastic(E=210e9, nu=0.3)
-        eigenvalues = np.linalg.eigvals(elastic.D)
+        # D 对称，使用对称特征值求解器 (实数结果，无需一般矩阵的 geev)
+        eigenvalues = np.linalg.eigvalsh(elastic.D)
         assert np.all(eigenvalues > 0), "弹性矩阵应正定"
     
     def test_uniaxial_stress(self):
@@ -51,6 +52,14 @@ class TestIsotropicElastic:
         expected_factor = E * (1 - nu) / ((1 + nu) * (1 - 2 * nu))
         assert np.isclose(stress[0], expected_factor * 0.001, rtol=1e-10)
     
+    def test_stress_matches_matrix(self):
+        """展开式应力计算与 D @ ε 一致"""
+        elastic = IsotropicElastic(E=210e9, nu=0.3)
+        strain = np.array([1e-3, -2e-4, 5e-4, 3e-4, -1e-4, 2e-4])
+        stress, tangent = elastic.compute_stress(strain)
+        assert np.allclose(stress, elastic.D @ strain, rtol=1e-12)
+        assert np.array_equal(tangent, elastic.D)
+    
     def test_shear_modulus(self):
         """测试剪切模量"""
         E, nu = 210e9, 0.3
@@ -222,6 +231,25 @@ class TestJ2PlasticMaterial:
         result = mat.compute_stress(F, state)
         
         assert np.allclose(result.tangent, result.tangent.T), "切线模量应对称"
+    
+    def test_batch_matches_pointwise(self):
+        """批量计算应与逐点 compute_stress 一致 (含弹性与塑性点)"""
+        mat = J2PlasticMaterial(E=210e9, nu=0.3, yield_stress=250e6, hardening=1e9)
+        F_all = np.array([
+            np.eye(3) + 0.0001 * np.diag([1, -0.3, -0.3]),
+            np.eye(3) + 0.01 * np.diag([1, -0.3, -0.3]),
+            np.eye(3) + 0.004 * np.array([[0, 1, 0], [0.5, 0, 0], [0, 0, 0.2]]),
+        ])
+        ep_old = np.array([0.0, 0.0, 1e-3])
+        stress, tangent, ep_new, is_plastic = mat.compute_stress_batch(F_all, ep_old)
+        
+        for q in range(len(F_all)):
+            ref = mat.compute_stress(F_all[q], PlasticState(equivalent_plastic_strain=ep_old[q]))
+            assert is_plastic[q] == ref.is_plastic
+            assert np.allclose(stress[q], ref.stress, rtol=1e-12)
+            assert np.allclose(tangent[q], ref.tangent, rtol=1e-12)
+            assert np.isclose(ep_new[q], ref.state.equivalent_plastic_strain, rtol=1e-12)
+        assert is_plastic[1] and not is_plastic[0]
 
 
 class TestMaterialFactory:
@@ -274,6 +302,18 @@ class TestVoigtConversions:
         T_back = voigt_to_tensor(v, engineering=True)
         
         assert np.allclose(T, T_back)
+    
+    def test_batch_conversion(self):
+        """测试批量输入与逐个转换一致"""
+        T = np.array([
+            [[100, 30, 20], [30, 80, 15], [20, 15, 60]],
+            [[1, 2, 3], [2, 4, 5], [3, 5, 6]],
+        ], dtype=float)
+        
+        v = tensor_to_voigt(T, engineering=True)
+        assert v.shape == (2, 6)
+        assert np.allclose(v[1], [1, 4, 6, 10, 6, 4])
+        assert np.allclose(voigt_to_tensor(v, engineering=True), T)
 
 
 if __name__ == '__main__':
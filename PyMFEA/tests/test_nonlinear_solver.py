@@ -0,0 +1,159 @@
+# 文件: PyMFEA/tests/test_nonlinear_solver.py
+"""
+非线性求解器单元测试
+"""
+
+import sys
+import types
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+from core.element_nonlinear import C3D8_TL
+from core.materials import MaterialFactory
+from core.node import Node
+from solver.nonlinear_solver import NonlinearSolver
+
+
+class _QuadraticResidual:
+    """
+    一维残差 R(α) = T(1 - α + γα²) 的组装器替身 (第 0 个自由度)
+
+    对 du = 1 即 Newton 方向 (R'(0) = -R(0))，γ 为已知曲率。
+    """
+
+    def __init__(self, T, gamma):
+        self.T = T
+        self.gamma = gamma
+        self.calls = []
+
+    def assemble_internal_force(self, element_routine, u_current):
+        a = u_current[0]
+        self.calls.append(a)
+        F = np.zeros_like(u_current)
+        F[0] = self.T * (a - self.gamma * a**2)
+        return F, False
+
+
+class _ConstantStressElement:
+    """恒定应力的单元替身，节点数任意"""
+
+    def __init__(self, node_ids, sigma):
+        self.nodes = [types.SimpleNamespace(id=i) for i in node_ids]
+        self.sigma = np.asarray(sigma, dtype=float)
+
+    def get_dof_indices(self):
+        return np.array([3 * (n.id - 1) + k for n in self.nodes for k in range(3)])
+
+    def calculate_cauchy_stress(self, u_elem):
+        return self.sigma
+
+
+class TestLineSearch:
+    """测试二次插值线搜索"""
+
+    def setup_method(self):
+        self.solver = NonlinearSolver([], 1, [], [])
+        self.du = np.array([1.0, 0.0, 0.0])
+        self.T = 10.0
+        self.target = np.array([self.T, 0.0, 0.0])
+
+    def test_full_step_accepted(self):
+        """线性残差：α = 1 直接满足 Armijo，只计算一次内力"""
+        asm = _QuadraticResidual(self.T, gamma=0.0)
+        alpha, res, ok = self.solver._line_search(np.zeros(3), self.du, self.target, asm, self.T)
+        assert ok and alpha == 1.0 and res == 0.0
+        assert asm.calls == [1.0]
+
+    def test_quadratic_step_taken(self):
+        """α = 1 失败时取抛物线极小点 α_q = 1 / (2(½γ² + ½))，而不是二分"""
+        gamma = 1.2
+        asm = _QuadraticResidual(self.T, gamma)
+        alpha, res, ok = self.solver._line_search(np.zeros(3), self.du, self.target, asm, self.T)
+        expected = 1.0 / (2.0 * (0.5 * gamma**2 + 0.5))
+        assert ok
+        assert np.isclose(alpha, expected, rtol=1e-12)
+        assert np.isclose(res, self.T * (1 - expected + gamma * expected**2), rtol=1e-12)
+        assert len(asm.calls) == 2
+
+    def test_step_clamped_then_bisected(self):
+        """α_q 截断到 0.1，仍不满足时二分一次，最多计算 3 次内力"""
+        asm = _QuadraticResidual(self.T, gamma=50.0)
+        alpha, _, _ = self.solver._line_search(np.zeros(3), self.du, self.target, asm, self.T)
+        assert asm.calls[:2] == [1.0, 0.1]
+        assert alpha == 0.05 and len(asm.calls) == 3
+
+
+class TestStressRecovery:
+    """测试节点应力恢复"""
+
+    def test_mixed_node_counts(self):
+        """节点数不为 8 的单元按实际节点展开，共享节点取平均"""
+        elements = [_ConstantStressElement(range(1, 9), [1, 0, 0, 0, 0, 0]),
+                    _ConstantStressElement([5, 6, 7, 9], [3, 0, 0, 0, 0, 0])]
+        solver = NonlinearSolver(elements, 9, [], [])
+        _, comps = solver.recover_nodal_stresses(np.zeros(27))
+        assert np.allclose(comps[:, 0], [1, 1, 1, 1, 2, 2, 2, 1, 3])
+
+
+def _two_cubes(top_a, top_b):
+    """
+    两个互不相连的单位立方体 (16 个节点)：底面节点固定为 1-4 与 9-12，
+    顶面节点由 top_a / top_b 指定。顶面节点编号不同时 K 的稀疏结构不同而 nnz 相同。
+    """
+    corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+               (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+    mat = MaterialFactory.create_elastic(E=70000.0, nu=0.3)
+    nodes = {}
+    elements = []
+    for e, (bottom, top, dx) in enumerate([((1, 2, 3, 4), top_a, 0.0), ((9, 10, 11, 12), top_b, 5.0)]):
+        ids = list(bottom) + list(top)
+        for nid, (x, y, z) in zip(ids, corners):
+            nodes[nid] = Node(nid, x + dx, y, z)
+        elements.append(C3D8_TL(e + 1, [nodes[i] for i in ids], mat))
+    return elements
+
+
+class TestDiagonalPositions:
+    """测试罚函数对角元位置缓存"""
+
+    CONFIG = {"total_time": 1.0, "initial_dt": 1.0, "max_iter": 10, "tolerance": 1e-8, "verbose": 0}
+
+    def test_pattern_change_with_same_nnz(self):
+        """单元集合变化后即使 nnz 不变也重新计算对角元位置"""
+        cons = [{'node_id': n, 'dof': d} for n in (1, 2, 3, 4, 9, 10, 11, 12) for d in range(3)]
+        loads = [{'node_id': n, 'dof': 2, 'value': 50.0} for n in range(5, 9)]
+        loads += [{'node_id': n, 'dof': 2, 'value': 50.0} for n in range(13, 17)]
+
+        ref = NonlinearSolver(_two_cubes((13, 14, 15, 16), (5, 6, 7, 8)), 16, cons, loads,
+                              dict(self.CONFIG)).solve()
+
+        solver = NonlinearSolver(_two_cubes((5, 6, 7, 8), (13, 14, 15, 16)), 16, cons, loads,
+                                 dict(self.CONFIG))
+        solver.solve()
+        solver.elements = _two_cubes((13, 14, 15, 16), (5, 6, 7, 8))
+        solver.u_current = np.zeros(solver.num_dofs)
+        u = solver.solve()
+        assert np.allclose(u, ref, rtol=1e-8, atol=1e-12)
+
+
+class TestVerbosity:
+    """测试日志级别"""
+
+    @pytest.mark.parametrize("verbose", [0, None])
+    def test_log_callback_calls(self, verbose):
+        """verbose = 0 时不调用 log_callback，默认级别输出迭代表格"""
+        cons = [{'node_id': n, 'dof': d} for n in (1, 2, 3, 4, 9, 10, 11, 12) for d in range(3)]
+        loads = [{'node_id': n, 'dof': 2, 'value': 50.0} for n in range(5, 9)]
+        config = {"total_time": 1.0, "initial_dt": 0.5, "max_iter": 10, "tolerance": 1e-8}
+        if verbose is not None:
+            config["verbose"] = verbose
+        solver = NonlinearSolver(_two_cubes((5, 6, 7, 8), (13, 14, 15, 16)), 16, cons, loads, config)
+        messages = []
+        solver.set_log_callback(messages.append)
+        solver.solve()
+        assert (len(messages) == 0) == (verbose == 0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
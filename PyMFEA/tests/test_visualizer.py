@@ -0,0 +1,59 @@
+# 文件: PyMFEA/tests/test_visualizer.py
+"""
+可视化辅助函数单元测试 (需要 PyVista)
+"""
+
+import sys
+sys.path.insert(0, 'PyMFEA')
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pyvista')
+
+import utils.visualizer as visualizer
+from utils.visualizer import FEMVisualizer
+
+
+class TestVonMises:
+    """测试 Von Mises 等效应力计算"""
+
+    @pytest.mark.skipif(not visualizer.NUMBA_AVAILABLE, reason="numba 未安装")
+    def test_kernel_matches_numpy(self, monkeypatch):
+        """Numba 内核与 einsum 路径结果一致"""
+        s = np.random.default_rng(0).normal(scale=100.0, size=(1000, 6))
+
+        monkeypatch.setattr(visualizer, 'NUMBA_MIN_ROWS', 10**9)
+        ref = FEMVisualizer.calc_von_mises(s)
+        monkeypatch.setattr(visualizer, 'NUMBA_MIN_ROWS', 1)
+        out = FEMVisualizer.calc_von_mises(s)
+        assert np.allclose(out, ref, rtol=1e-12, atol=0.0)
+
+    def test_uniaxial(self):
+        """单轴应力状态下等效应力等于轴向应力"""
+        s = np.array([[250.0, 0.0, 0.0, 0.0, 0.0, 0.0]])
+        assert np.allclose(FEMVisualizer.calc_von_mises(s), [250.0])
+
+
+class TestMeshCache:
+    """测试 parse_mesh_to_vtk 的网格复用"""
+
+    def test_cached_grids_have_independent_results(self):
+        """同一网格再次调用返回新网格，不改动上一次返回网格的 point_data"""
+        corners = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+                   (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]
+        nodes = {i + 1: [float(x), float(y), float(z)] for i, (x, y, z) in enumerate(corners)}
+        elements = {1: list(range(1, 9))}
+        vis = FEMVisualizer()
+
+        g1 = vis.parse_mesh_to_vtk(nodes, elements, displacement=np.ones((8, 3)), stress=np.arange(8.0))
+        g2 = vis.parse_mesh_to_vtk(nodes, elements, displacement=np.full((8, 3), 2.0))
+        assert g2 is not g1
+        assert sorted(g1.point_data.keys()) == ['Displacement', 'VonMises']
+        assert sorted(g2.point_data.keys()) == ['Displacement']
+        assert np.all(g1.point_data['Displacement'] == 1.0)
+        assert np.all(g2.point_data['Displacement'] == 2.0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,6 +1,82 @@
+import io
+import mmap
+import os
 import re
+import warnings
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 数值字段 (允许两侧空白)，用于在混合行中筛选数值项
+_NUMERIC_RE = re.compile(r'\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*')
+
+# 关键字行参数 (已转大写)：", KEY=VALUE" 或无值标志 ", GENERATE"
+_PARAM_RE = re.compile(r',\s*([A-Z_][A-Z0-9_ ]*?)\s*(?:=\s*([^,]*?))?\s*(?=,|$)')
+
+# 关键字行 (首个非空白字符为 *，** 注释除外)：行首匹配 / 查找下一条关键字行的换行符
+_KEYWORD_LINE_RE = re.compile(rb'[ \t]*\*(?!\*)')
+_NEXT_KEYWORD_RE = re.compile(rb'\n(?=[ \t]*\*(?!\*))')
+
+# C3D8 各面的局部节点索引 (0-based)，1-2-3-4 为底面，5-6-7-8 为顶面
+FACE_IDX = np.array([
+    [0, 3, 2, 1],   # S1 Bottom
+    [4, 5, 6, 7],   # S2 Top
+    [0, 1, 5, 4],   # S3 Front
+    [1, 2, 6, 5],   # S4 Right
+    [2, 3, 7, 6],   # S5 Back
+    [3, 0, 4, 7],   # S6 Left
+], dtype=np.int8)
+FACE_ID = {f'S{i + 1}': i for i in range(6)}
+
+# *BOUNDARY 简写 -> 约束自由度 (0-based)
+BC_SHORTCUTS = {
+    'XSYMM': np.array([0, 4, 5]),
+    'YSYMM': np.array([1, 3, 5]),
+    'ZSYMM': np.array([2, 3, 4]),
+    'PINNED': np.array([0, 1, 2]),
+    'ENCASTRE': np.arange(6),
+}
+_NO_IDS = np.zeros(0, dtype=np.int64)
+
+# 面数超过该阈值时才使用 Numba 内核 (小模型不值得付出首次 JIT 编译开销)
+NUMBA_MIN_FACES = 20000
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _expand_pressure(node_coords, face_rows, press_mag, out_force):
+        """
+        融合内核：逐面计算对角线叉积、面积、法向，并写出每个面节点的等效节点力。
+
+        Args:
+            node_coords: 节点坐标 (N, 3)
+            face_rows: 面节点行号 (F, 4)
+            press_mag: 压力
+            out_force: 输出，每个面上单个节点分得的力 (F, 3)
+        """
+        n_face_nodes = face_rows.shape[1]
+        for f in prange(face_rows.shape[0]):
+            p0 = node_coords[face_rows[f, 0]]
+            p1 = node_coords[face_rows[f, 1]]
+            p2 = node_coords[face_rows[f, 2]]
+            p3 = node_coords[face_rows[f, 3]]
+            ax = p2[0] - p0[0]; ay = p2[1] - p0[1]; az = p2[2] - p0[2]
+            bx = p3[0] - p1[0]; by = p3[1] - p1[1]; bz = p3[2] - p1[2]
+            cx = ay * bz - az * by
+            cy = az * bx - ax * bz
+            cz = ax * by - ay * bx
+            vn = np.sqrt(cx * cx + cy * cy + cz * cz)
+            scale = -press_mag * (0.5 * vn)
+            inv = vn + 1e-20
+            out_force[f, 0] = scale * (cx / inv) / n_face_nodes
+            out_force[f, 1] = scale * (cy / inv) / n_face_nodes
+            out_force[f, 2] = scale * (cz / inv) / n_face_nodes
+
+
 class InpParser:
     """
     简化封装的 Abaqus INP 文本解析器。
@@ -16,264 +92,414 @@ class InpParser:
     def __init__(self):
         self.nodes = {}      # {node_id: [x, y, z]}
         self.elements = {}   # {elem_id: [n1, n2, ...]}
-        self.nsets = {}      # {set_name: [id1, id2, ...]}
-        self.elsets = {}     # {set_name: [id1, id2, ...]}
+        
+        # 节点/单元表的列式存储 (与 self.nodes / self.elements 内容一致)
+        self.node_ids = np.zeros(0, dtype=np.int64)      # (N,)
+        self.node_coords = np.zeros((0, 3))              # (N, 3) 全局坐标
+        self.elem_ids = np.zeros(0, dtype=np.int64)      # (E,)
+        self.elem_conn = np.zeros((0, 8), dtype=np.int64)  # (E, 最大节点数) 节点 ID，不足处补 0
+        self._nrow = {}      # {node_id: node_coords 行号}
+        self._erow = {}      # {elem_id: elem_conn 行号}
+        self.nsets = {}      # {set_name: np.ndarray(int64) 节点 ID}
+        self.elsets = {}     # {set_name: np.ndarray(int64) 单元 ID}
         self.surfaces = {}   # {surf_name: [(eid, face_id), ...]}
         self.materials = {}  # {mat_name: {'E': float, 'nu': float, 'density': float}}
         self.constraints = [] # list of dict
         self.loads = []       # list of dict
         
-        # 坐标变换状态（*SYSTEM）
+        # *DSLOAD 展开的等效节点力 (列式存储，每个面集合追加一段数组)
+        self.point_loads_nodes = []   # list of np.ndarray (int64) 节点 ID
+        self.point_loads_dofs = []    # list of np.ndarray (int64) 自由度 0,1,2
+        self.point_loads_values = []  # list of np.ndarray (float64) 节点力
+        
+        # 坐标变换状态（*SYSTEM）：仅支持平移，P2/P3 定义的局部坐标轴旋转暂不支持
         self.origin = np.array([0.0, 0.0, 0.0])
-        self.rotation = np.eye(3)
         
-        # 材料解析状态：记录最近一次 *MATERIAL 声明的材料名
+        # 材料解析状态：记录最近一次 *MATERIAL 声明的材料名及其参数字典
         self.current_material = None
+        self._current_props = None  # self.materials[self.current_material]
+        
+        # 关键字 -> 处理函数 (O(1) 哈希分派)，处理函数签名：
+        #   handler(params) -> (数据行处理函数, 块结束回调)
+        # params 为关键字行参数字典 (见 _parse_params)
+        # 未注册的关键字 (如 *NODE OUTPUT、*HEADING) 的数据行被忽略
+        # 大数据块关键字：直接在文件映射上定位块边界，整块文本交给 NumPy 解析
+        self._bulk_dispatch = {
+            '*NODE': self._process_node_block,
+            '*ELEMENT': self._process_element_block,
+        }
+        self._dispatch = {
+            '*SYSTEM': self._handle_system,
+            '*NSET': self._handle_nset,
+            '*ELSET': self._handle_elset,
+            '*SURFACE': self._handle_surface,
+            '*BOUNDARY': self._handle_boundary,
+            '*CLOAD': self._handle_cload,
+            '*DSLOAD': self._handle_dsload,
+            '*MATERIAL': self._handle_material,
+            '*ELASTIC': self._handle_elastic,
+            '*DENSITY': self._handle_density,
+            '*PLASTIC': self._handle_plastic,
+        }
 
     def read(self, filename):
-        """从 INP 文件中读取并解析全部支持的关键字。"""
+        """
+        从 INP 文件中读取并解析全部支持的关键字。
+
+        单遍流式解析：文件以 mmap 只读映射，按字节顺序扫描，
+        关键字行切换当前状态，数据行直接交给当前关键字的处理函数；
+        *NODE / *ELEMENT 大数据块不逐行解码，直接定位块边界后整块解析。
+        """
         print(f"正在解析 INP 文件: {filename} ...")
         
-        with open(filename, 'r') as f:
-            # 预读取所有行，去除换行符
-            all_lines = [line.strip() for line in f.readlines()]
+        with open(filename, 'rb') as f:
+            # 空文件无法建立映射
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    self._parse_buffer(mm)
             
-        idx = 0
-        total_lines = len(all_lines)
+        return {
+            'nodes': self.nodes,
+            'elements': self.elements,
+            'nsets': self.nsets,
+            'elsets': self.elsets,
+            'surfaces': self.surfaces,
+            'materials': self.materials,
+            'constraints': self.constraints,
+            'loads': self.loads,
+            'point_loads': self.point_loads(),
+        }
+
+    def point_loads(self):
+        """
+        面载荷展开得到的等效节点力 (列式数组)。
+
+        Returns:
+            dict: {'node_ids': (n,) int64, 'dofs': (n,) int64, 'values': (n,) float64}，
+                字段名与 solver.boundary_conditions.ConstraintArray 一致。
+        """
+        def cat(parts, dtype):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+        return {
+            'node_ids': cat(self.point_loads_nodes, np.int64),
+            'dofs': cat(self.point_loads_dofs, np.int64),
+            'values': cat(self.point_loads_values, np.float64),
+        }
+
+    def _parse_buffer(self, buf):
+        """扫描整个文件缓冲区 (mmap 或 bytes)，逐关键字分派。"""
+        on_line = None  # 当前关键字的数据行处理函数
+        on_end = None   # 当前关键字数据块结束时的回调 (需要整块处理的关键字)
         
-        while idx < total_lines:
-            line = all_lines[idx]
+        pos = 0
+        size = len(buf)
+        while pos < size:
+            eol = buf.find(b'\n', pos)
+            if eol < 0:
+                eol = size
+            line = buf[pos:eol].decode('utf-8', errors='replace').strip()
+            pos = eol + 1
             
             # 跳过空行和注释
             if not line or line.startswith('**'):
-                idx += 1
                 continue
             
-            if line.startswith('*'):
-                keyword_line = line.upper()
-                
-                # --- *SYSTEM: 全局坐标变换 ---
-                if '*SYSTEM' in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    vals = self._parse_csv_matrix(blk)
-                    if len(vals) > 0:
-                        # P1: 原点坐标
-                        p1 = np.array(vals[0][:3])
-                        # P2 等信息暂未用到，如后续需要可扩展为完整旋转矩阵
-                        self.origin = p1
-                    idx = next_idx
-                    continue
+            # 关键字与集合/面/材料名大小写不敏感：在读入时统一转大写一次，
+            # 之后各处理函数不再重复调用 upper()
+            line = line.upper()
+            
+            if not line.startswith('*'):
+                if on_line is not None:
+                    on_line(line)
+                # 不属于任何支持关键字的数据行直接忽略
+                continue
+            
+            # 新关键字：先结束上一个数据块，再切换状态
+            if on_end is not None:
+                on_end()
+            keyword_line = line
+            
+            bulk = self._bulk_dispatch.get(self._keyword_name(keyword_line))
+            if bulk is not None:
+                end = self._find_block_end(buf, pos)
+                bulk(buf[pos:end].decode('utf-8', errors='replace'))
+                pos = end
+                on_line, on_end = None, None
+            else:
+                on_line, on_end = self._begin_keyword(keyword_line)
+        
+        if on_end is not None:
+            on_end()
 
-                # --- *NODE: 节点坐标 ---
-                elif '*NODE' in keyword_line and 'OUTPUT' not in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    raw_data = self._parse_csv_matrix(blk)
-                    
-                    for row in raw_data:
-                        if len(row) < 4: continue
-                        nid = int(row[0])
-                        local_coords = np.array(row[1:4])
-                        # 应用上一步 *SYSTEM 定义的平移/旋转
-                        global_coords = self.origin + local_coords @ self.rotation
-                        self.nodes[nid] = global_coords.tolist()
-                    
-                    idx = next_idx
-                    continue
-                
-                # --- *ELEMENT: 单元拓扑 ---
-                elif '*ELEMENT' in keyword_line and 'OUTPUT' not in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    raw_data = self._parse_csv_matrix(blk)
-                    
-                    for row in raw_data:
-                        eid = int(row[0])
-                        # 节点 ID 转整数，忽略 0 作为补零占位
-                        nids = [int(x) for x in row[1:] if x != 0]
-                        self.elements[eid] = nids
-                        
-                    idx = next_idx
-                    continue
-                
-                # --- *NSET: 节点集合 ---
-                elif '*NSET' in keyword_line:
-                    name = self._extract_param(keyword_line, 'NSET')
-                    is_gen = 'GENERATE' in keyword_line
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    
-                    if name:
-                        ids = self._parse_ids(blk, is_gen)
-                        if name not in self.nsets: self.nsets[name] = []
-                        self.nsets[name].extend(ids)
-                    
-                    idx = next_idx
-                    continue
-                
-                # --- *ELSET: 单元集合 ---
-                elif '*ELSET' in keyword_line:
-                    name = self._extract_param(keyword_line, 'ELSET')
-                    is_gen = 'GENERATE' in keyword_line
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    
-                    if name:
-                        name_upper = name.upper()  # 统一转大写存储，避免大小写问题
-                        ids = self._parse_ids(blk, is_gen)
-                        if name_upper not in self.elsets: self.elsets[name_upper] = []
-                        self.elsets[name_upper].extend(ids)
-                        
-                    idx = next_idx
-                    continue
+    @staticmethod
+    def _find_block_end(buf, start):
+        """
+        返回从 start (行首) 开始的数据块结束位置，即下一条关键字行的行首。
 
-                # --- *SURFACE: 面集合（后续用于压力等面载荷） ---
-                elif '*SURFACE' in keyword_line:
-                    name = self._extract_param(keyword_line, 'NAME')
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    
-                    if name:
-                        name_upper = name.upper()  # 统一转大写存储
-                        if name_upper not in self.surfaces: self.surfaces[name_upper] = []
-                        for l in blk:
-                            parts = self._split_line(l)
-                            if len(parts) >= 2:
-                                # 形式：Eset/Eid, FaceID (S1, S2, ...)
-                                self.surfaces[name_upper].append((parts[0].upper(), parts[1].upper()))
-                                
-                    idx = next_idx
-                    continue
+        与逐行扫描一致，首个非空白字符为 * 的行即为关键字行 (允许缩进)，** 注释行除外。
+        """
+        if _KEYWORD_LINE_RE.match(buf, start):
+            return start
+        m = _NEXT_KEYWORD_RE.search(buf, start)
+        return m.end() if m else len(buf)
 
-                # --- *BOUNDARY: 约束条件 ---
-                elif '*BOUNDARY' in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    self._process_boundary_block(blk)
-                    idx = next_idx
-                    continue
+    @staticmethod
+    def _keyword_name(keyword_line):
+        """关键字行中的关键字名 (第一个逗号之前的部分)。"""
+        return keyword_line.split(',', 1)[0].strip()
 
-                # --- *CLOAD: 节点集中力 ---
-                elif '*CLOAD' in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    self._process_cload_block(blk)
-                    idx = next_idx
-                    continue
+    def _begin_keyword(self, keyword_line):
+        """
+        处理关键字行并返回该关键字的 (数据行处理函数, 块结束回调)。
 
-                # --- *DSLOAD: 面载荷（压力） ---
-                elif '*DSLOAD' in keyword_line:
-                    blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                    self._process_dsload_block(blk)
-                    idx = next_idx
-                    continue
+        关键字行参数只解析一次，以字典形式传给处理函数。
+        节点、单元、集合等大数据量关键字逐行处理；
+        约束、载荷、材料等小数据块先收集，块结束时整体处理。
+        不支持的关键字返回 (None, None)，其数据行被忽略。
+        """
+        handler = self._dispatch.get(self._keyword_name(keyword_line))
+        if handler is None:
+            return None, None
+        return handler(self._parse_params(keyword_line))
+
+    # ================= 关键字处理函数 =================
+
+    def _handle_system(self, params):
+        """*SYSTEM: 全局坐标变换"""
+        return self._collect_block(self._process_system_block)
+
+    def _handle_nset(self, params):
+        """*NSET: 节点集合"""
+        name = params.get('NSET')
+        if not name:
+            return None, None
+        return self._id_set_block(self.nsets, name, 'GENERATE' in params)
+
+    def _handle_elset(self, params):
+        """*ELSET: 单元集合"""
+        name = params.get('ELSET')
+        if not name:
+            return None, None
+        return self._id_set_block(self.elsets, name, 'GENERATE' in params)
+
+    def _id_set_block(self, set_map, name, is_gen):
+        """
+        集合数据块：块结束时一次性生成 int64 ID 数组 (同名集合追加在原数组之后)。
 
-                # --- *MATERIAL: 材料名称 ---
-                elif '*MATERIAL' in keyword_line:
-                    name = self._extract_param(keyword_line, 'NAME')
-                    if name:
-                        self.current_material = name.upper()
-                        if self.current_material not in self.materials:
-                            self.materials[self.current_material] = {
-                                'E': None,
-                                'nu': None,
-                                'density': None
-                            }
-                    idx += 1
-                    continue
+        普通数据行先收集，块结束时整块解析 (见 _parse_id_block)；
+        GENERATE 行直接生成 np.arange 片段。
+        """
+        lines = []  # 普通数据行
+        parts = []  # GENERATE 片段
 
-                # --- *ELASTIC: 弹性参数 ---
-                elif '*ELASTIC' in keyword_line:
-                    if self.current_material:
-                        blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                        self._process_elastic_block(blk)
-                        idx = next_idx
-                    else:
-                        idx += 1
-                    continue
+        def on_line(line):
+            if is_gen:
+                parts.append(self._parse_id_line(line, True))
+            else:
+                lines.append(line)
+
+        def on_end():
+            new = parts if is_gen else [self._parse_id_block(lines)]
+            set_map[name] = np.concatenate([set_map.get(name, _NO_IDS)] + new)
+        return on_line, on_end
+
+    def _handle_surface(self, params):
+        """*SURFACE: 面集合（后续用于压力等面载荷）"""
+        name = params.get('NAME')
+        if not name:
+            return None, None
+        faces = self.surfaces.setdefault(name, [])
+        
+        def on_surface_line(line):
+            parts = self._split_line(line)
+            if len(parts) >= 2:
+                # 形式：Eset/Eid, FaceID (S1, S2, ...)
+                faces.append((parts[0], parts[1]))
+        return on_surface_line, None
+
+    def _handle_boundary(self, params):
+        """*BOUNDARY: 约束条件"""
+        return self._collect_block(self._process_boundary_block)
+
+    def _handle_cload(self, params):
+        """*CLOAD: 节点集中力"""
+        return self._collect_block(self._process_cload_block)
+
+    def _handle_dsload(self, params):
+        """*DSLOAD: 面载荷（压力）"""
+        return self._collect_block(self._process_dsload_block)
+
+    def _handle_material(self, params):
+        """*MATERIAL: 材料名称"""
+        name = params.get('NAME')
+        if name:
+            self.current_material = name
+            if name not in self.materials:
+                self.materials[name] = {
+                    'E': None,
+                    'nu': None,
+                    'density': None
+                }
+            # 缓存参数字典，后续 *ELASTIC/*DENSITY/*PLASTIC 直接写入
+            self._current_props = self.materials[name]
+        return None, None
+
+    def _handle_elastic(self, params):
+        """*ELASTIC: 弹性参数"""
+        if not self.current_material:
+            return None, None
+        return self._collect_block(self._process_elastic_block)
 
-                # --- *DENSITY: 密度 ---
-                elif '*DENSITY' in keyword_line:
-                    if self.current_material:
-                        blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                        self._process_density_block(blk)
-                        idx = next_idx
-                    else:
-                        idx += 1
-                    continue
+    def _handle_density(self, params):
+        """*DENSITY: 密度"""
+        if not self.current_material:
+            return None, None
+        return self._collect_block(self._process_density_block)
 
-                # --- *PLASTIC: 塑性参数 ---
-                elif '*PLASTIC' in keyword_line:
-                    if self.current_material:
-                        blk, next_idx = self._read_data_block(all_lines, idx + 1)
-                        self._process_plastic_block(blk)
-                        idx = next_idx
-                    else:
-                        idx += 1
-                    continue
+    def _handle_plastic(self, params):
+        """*PLASTIC: 塑性参数"""
+        if not self.current_material:
+            return None, None
+        return self._collect_block(self._process_plastic_block)
 
-            # 如果不是关键字也不是空行，继续下一行
-            idx += 1
-            
-        return {
-            'nodes': self.nodes,
-            'elements': self.elements,
-            'nsets': self.nsets,
-            'elsets': self.elsets,
-            'surfaces': self.surfaces,
-            'materials': self.materials,
-            'constraints': self.constraints,
-            'loads': self.loads
-        }
+    def _collect_block(self, process):
+        """为需要整块处理的关键字收集数据行，块结束时调用 process(blk)。"""
+        blk = []
+        return blk.append, lambda: process(blk)
+
+    def _process_node_block(self, text):
+        """
+        *NODE 数据块：nid, x, y, z
+
+        整块文本交给 np.loadtxt 一次解析为 (N, 4) 数组，坐标变换也一次完成；
+        数据不规整 (如缺列) 时退回逐行解析。
+        """
+        try:
+            arr = self._loadtxt(text, usecols=(0, 1, 2, 3))
+        except ValueError:
+            blk = self._block_lines(text)
+            rows = [row[:4] for row in self._parse_csv_matrix(blk) if len(row) >= 4]
+            arr = np.array(rows, dtype=float).reshape(-1, 4)
+        if len(arr) == 0:
+            return
+        
+        ids = arr[:, 0].astype(np.int64)
+        # 应用上一步 *SYSTEM 定义的平移
+        coords = arr[:, 1:4] + self.origin
+        
+        start = len(self.node_ids)
+        self.node_ids = np.concatenate([self.node_ids, ids])
+        self.node_coords = np.concatenate([self.node_coords, coords])
+        # 重复 ID 以后出现的为准，与字典覆盖语义一致
+        self._nrow.update(zip(ids.tolist(), range(start, start + len(ids))))
+        self.nodes.update(zip(ids.tolist(), coords.tolist()))
+
+    def _process_element_block(self, text):
+        """
+        *ELEMENT 数据块：eid, n1, n2, ...
+
+        规整数据块一次性解析为整数数组；含续行、尾逗号等不规整数据时退回逐行解析。
+        """
+        try:
+            arr = self._loadtxt(text).astype(np.int64)
+            if len(arr) == 0:
+                return
+            ids, conn = arr[:, 0], arr[:, 1:]
+        except ValueError:
+            rows = self._parse_csv_matrix(self._block_lines(text))
+            if not rows:
+                return
+            width = max(len(row) for row in rows) - 1
+            ids = np.array([int(row[0]) for row in rows], dtype=np.int64)
+            conn = np.zeros((len(rows), width), dtype=np.int64)
+            for r, row in enumerate(rows):
+                conn[r, :len(row) - 1] = row[1:]
+        
+        # 与已有单元表对齐列数 (不足补 0，0 即 Abaqus 的补零占位)
+        width = max(conn.shape[1], self.elem_conn.shape[1])
+        conn = np.pad(conn, ((0, 0), (0, width - conn.shape[1])))
+        old = np.pad(self.elem_conn, ((0, 0), (0, width - self.elem_conn.shape[1])))
+        
+        start = len(self.elem_ids)
+        self.elem_ids = np.concatenate([self.elem_ids, ids])
+        self.elem_conn = np.concatenate([old, conn])
+        self._erow.update(zip(ids.tolist(), range(start, start + len(ids))))
+        
+        # 节点 ID 列表忽略 0 补零占位
+        if np.all(conn != 0):
+            self.elements.update(zip(ids.tolist(), conn.tolist()))
+        else:
+            for eid, row in zip(ids.tolist(), conn.tolist()):
+                self.elements[eid] = [n for n in row if n != 0]
 
     # ================= 辅助方法 (Helpers) =================
 
-    def _read_data_block(self, lines, idx):
-        """读取从给定行开始、直到下一条关键字行（以 * 开头）的数据块。"""
-        blk = []
-        while idx < len(lines):
-            l = lines[idx].strip()
-            # 如果遇到新关键字 (且不是注释 **)，则停止
-            if l.startswith('*') and not l.startswith('**'):
-                break
-            if l and not l.startswith('**'):
-                blk.append(l)
-            idx += 1
-        return blk, idx
+    def _loadtxt(self, text, usecols=None):
+        """用 np.loadtxt 解析整块逗号分隔文本 (跳过空行与 ** 注释)，返回二维数组。"""
+        with warnings.catch_warnings():
+            # 空数据块 (只有注释/空行) 时 loadtxt 会发出警告，这里按空块处理
+            warnings.simplefilter('ignore', UserWarning)
+            return np.loadtxt(io.StringIO(text), delimiter=',', usecols=usecols,
+                              ndmin=2, comments='**')
+
+    def _block_lines(self, text):
+        """将数据块文本拆分为去除空行与注释的行列表 (逐行解析的后备路径)。"""
+        lines = (l.strip() for l in text.splitlines())
+        return [l for l in lines if l and not l.startswith('**')]
+
+    def _parse_csv_row(self, line):
+        """解析一行逗号分隔的数值，自动忽略非数值项。"""
+        # 移除结尾逗号，处理换行续写的情况
+        parts = line.rstrip(',').split(',')
+        try:
+            # 纯数值行 (绝大多数情况)：整行一次转换
+            return [float(p) for p in parts]
+        except ValueError:
+            # 混合行：先用正则筛出数值项，避免逐项触发异常
+            return [float(p) for p in parts if _NUMERIC_RE.fullmatch(p)]
 
     def _parse_csv_matrix(self, blk):
-        """解析逗号分隔的数值矩阵，自动忽略非数值项。"""
+        """解析逗号分隔的数值矩阵，自动忽略非数值项与空行。"""
         res = []
         for line in blk:
-            # 移除结尾逗号，处理换行续写的情况
-            clean_line = line.rstrip(',') 
-            parts = clean_line.split(',')
-            row = []
-            for p in parts:
-                try:
-                    row.append(float(p))
-                except ValueError:
-                    pass
+            row = self._parse_csv_row(line)
             if row:
                 res.append(row)
         return res
 
-    def _parse_ids(self, blk, is_gen):
-        """解析 ID 列表，支持 Abaqus 中的 GENERATE 语法。"""
-        vals = self._parse_csv_matrix(blk)
-        ids = []
+    def _parse_id_block(self, lines):
+        """
+        将多行逗号分隔的 ID 一次性解析为 int64 数组。
+
+        整块拆分后一次转换为整数数组，不逐项调用 float()；
+        含集合名等非整数项时转换抛出 ValueError，退回逐行解析。
+        """
+        tokens = ' '.join(lines).replace(',', ' ').split()
+        try:
+            return np.array(tokens, dtype=np.int64)
+        except ValueError:
+            pass
+        return np.array([x for l in lines for x in self._parse_csv_row(l)], dtype=np.int64)
+
+    def _parse_id_line(self, line, is_gen):
+        """解析一行 ID 列表为 int64 数组，支持 Abaqus 中的 GENERATE 语法。"""
+        row = self._parse_csv_row(line)
         if is_gen:
-            for row in vals:
-                if len(row) >= 3:
-                    start, end, step = int(row[0]), int(row[1]), int(row[2])
-                    ids.extend(range(start, end + 1, step))
-        else:
-            for row in vals:
-                ids.extend([int(x) for x in row])
-        return ids
-
-    def _extract_param(self, header, key):
-        """从关键字行中提取形如 KEY=VALUE 的参数值（例如 NSET=XYZ）。"""
-        parts = header.split(',')
-        for p in parts:
-            if '=' in p:
-                k, v = p.split('=')
-                if k.strip() == key:
-                    return v.strip()
-        return None
+            if len(row) >= 3:
+                start, end, step = int(row[0]), int(row[1]), int(row[2])
+                return np.arange(start, end + 1, step, dtype=np.int64)
+            return _NO_IDS
+        return np.array(row, dtype=np.int64)
+
+    @staticmethod
+    def _parse_params(header):
+        """
+        一次性解析关键字行参数为字典，例如
+        "*NSET, NSET=XYZ, GENERATE" -> {'NSET': 'XYZ', 'GENERATE': None}。
+
+        无值的标志参数值为 None，用成员测试 ('GENERATE' in params) 判断。
+        """
+        return {m.group(1): m.group(2) for m in _PARAM_RE.finditer(header)}
 
     def _split_line(self, line):
         """按逗号拆分一行字符串，并去除两端空白。"""
@@ -281,85 +507,87 @@ class InpParser:
 
     def _resolve_ids(self, target, set_map):
         """
-        根据字符串解析为 ID 列表。
+        根据字符串 (已为大写) 解析为 ID 数组 (int64)。
 
         若 target 在 set_map 中，则返回对应集合；
         否则尝试将其解析为单个整数 ID。
         """
-        target = target.upper()
         if target in set_map:
             return set_map[target]
         else:
             try:
-                return [int(target)]
+                return np.array([int(target)], dtype=np.int64)
             except ValueError:
-                return []
+                return _NO_IDS
 
     # ================= 业务逻辑处理 =================
 
+    def _process_system_block(self, blk):
+        """
+        解析 *SYSTEM 数据块，设置后续节点的坐标原点。
+
+        P1 (原点) 缺省的坐标按 0 补齐，与 Abaqus 一致；没有数据行时恢复全局坐标系。
+        P2/P3 (局部坐标轴方向) 忽略，即不支持旋转。
+        """
+        vals = self._parse_csv_matrix(blk)
+        p1 = vals[0][:3] if vals else []
+        self.origin = np.zeros(3)
+        self.origin[:len(p1)] = p1
+
     def _process_boundary_block(self, blk):
-        """解析 *BOUNDARY 数据块并填充 self.constraints 列表。"""
+        """
+        解析 *BOUNDARY 数据块并填充 self.constraints 列表。
+
+        集合约束每行只保存一条 {'set_name', 'dofs', 'value'}，dofs 为 0-based
+        自由度数组，由求解前的 ConstraintArray.expand_sets 向量化展开；
+        单个节点约束仍按 (节点, 自由度) 逐条保存。
+        """
         for line in blk:
             parts = self._split_line(line)
             if not parts: continue
             
             target = parts[0]
-            target_upper = target.upper()
             
-            # 检查 target 是否是 NSET 名称
-            is_set = target_upper in self.nsets
-            
-            dofs = []
+            dofs = _NO_IDS
             val = 0.0
             
             # 逻辑分支：
             #   Type 1: Node/Set, start_dof, end_dof, value
             #   Type 2: Node/Set, 关键字简写 (ENCASTRE, PINNED, XSYMM 等)
             if len(parts) >= 2:
-                p2 = parts[1].upper()
+                p2 = parts[1]
                 # 尝试转数字
                 try:
                     st = int(p2)
                     # 数字：起始自由度
-                    if len(parts) >= 3:
-                        ed = int(parts[2])
-                    else:
-                        ed = st
-                    
+                    ed = int(parts[2]) if len(parts) >= 3 else st
                     if len(parts) >= 4:
                         val = float(parts[3])
-                    
-                    dofs = list(range(st, ed + 1))
+                    # Abaqus 1-based -> Python 0-based，只保留 1~6 号自由度
+                    dofs = np.arange(max(st, 1) - 1, min(ed, 6))
                 except ValueError:
                     # 非数字：使用 Abaqus 的字符串简写 (ENCASTRE 等)
-                    if p2 == 'XSYMM': dofs = [1, 5, 6]
-                    elif p2 == 'YSYMM': dofs = [2, 4, 6]
-                    elif p2 == 'ZSYMM': dofs = [3, 4, 5]
-                    elif p2 == 'PINNED': dofs = [1, 2, 3]
-                    elif p2 == 'ENCASTRE': dofs = [1, 2, 3, 4, 5, 6]
+                    dofs = BC_SHORTCUTS.get(p2, _NO_IDS)
+            if len(dofs) == 0:
+                continue
             
             # 如果 target 是集合名，则以 set_name 形式保存，后续在装配阶段展开
-            if is_set:
-                for d in dofs:
-                    # 注意：Abaqus 1-based -> Python 0-based
-                    if 1 <= d <= 6:  # 支持所有自由度
+            if target in self.nsets:
+                self.constraints.append({
+                    'set_name': target,  # 保存set名称
+                    'dofs': dofs,
+                    'value': val
+                })
+            else:
+                # 否则尝试解析为单个节点 ID
+                dof_list = dofs.tolist()
+                for nid in self._resolve_ids(target, self.nsets).tolist():
+                    for d in dof_list:
                         self.constraints.append({
-                            'set_name': target_upper,  # 保存set名称
-                            'dof': d - 1,
+                            'node_id': nid,
+                            'dof': d,
                             'value': val
                         })
-            else:
-                # 否则尝试解析为单个节点 ID
-                ids = self._resolve_ids(target, self.nsets)
-                for nid in ids:
-                    for d in dofs:
-                        # 注意：Abaqus 1-based -> Python 0-based
-                        if 1 <= d <= 6:  # 支持所有自由度
-                            self.constraints.append({
-                                'node_id': nid,
-                                'dof': d - 1,
-                                'value': val
-                            })
 
     def _process_cload_block(self, blk):
         """解析 *CLOAD 数据块并填充 self.loads 列表。"""
@@ -368,24 +596,23 @@ class InpParser:
             if len(parts) < 3: continue
             
             target = parts[0]
-            target_upper = target.upper()
             dof = int(parts[1])
             mag = float(parts[2])
             
             # 检查 target 是否是 NSET 名称
-            is_set = target_upper in self.nsets
+            is_set = target in self.nsets
             
             if is_set:
                 # 若为集合则仅记录 set_name，求解阶段再展开为节点力
                 self.loads.append({
-                    'set_name': target_upper,
+                    'set_name': target,
                     'dof': dof - 1,
                     'value': mag
                 })
             else:
                 # 否则尝试解析为节点 ID
                 ids = self._resolve_ids(target, self.nsets)
-                for nid in ids:
+                for nid in ids.tolist():
                     self.loads.append({
                         'node_id': nid,
                         'dof': dof - 1,
@@ -396,126 +623,127 @@ class InpParser:
         """
         处理面载荷 (*DSLOAD)。
 
-        既保存 surface 级别的载荷信息用于可视化，
-        也将其近似展开为等效节点力并添加到 self.loads 供求解器使用。
+        既保存 surface 级别的载荷信息用于可视化 (self.loads)，
+        也将其近似展开为等效节点力，以列式数组存入 self.point_loads_* 供求解器使用。
+        同一面集合的所有面先收集节点，再批量计算几何属性与节点力。
         """
         for line in blk:
             parts = self._split_line(line)
             if len(parts) < 3: continue
             
-            surf_name = parts[0].upper()
+            surf_name = parts[0]
             # parts[1] 通常为 'P' (Pressure)，此处假定为均匀压力
             try:
                 press_mag = float(parts[2])
             except ValueError:
                 continue
 
-            surf_name_upper = surf_name.upper()
-            if surf_name_upper in self.surfaces:
-                face_defs = self.surfaces[surf_name_upper]
+            if surf_name in self.surfaces:
+                face_defs = self.surfaces[surf_name]
 
                 # 先保存 Surface 载荷信息（用于显示）
                 self.loads.append({
-                    'surface_name': surf_name_upper,
+                    'surface_name': surf_name,
                     'type': 'Pressure',
                     'value': press_mag
                 })
                 
-                # 然后展开成节点力（用于求解器，并在记录中标记来源）
+                # 收集所有面的 (单元行号, 面编号)
+                elem_rows = []
+                local_faces = []
                 for target_str, face_id in face_defs:
+                    f = FACE_ID.get(face_id)
+                    if f is None: continue
                     # target_str 可能是 ELSET 名称，也可能是单个 Element ID
-                    eids = self._resolve_ids(target_str.upper(), self.elsets)
-                    
-                    for eid in eids:
-                        if eid not in self.elements: continue
-                        elem_nodes = self.elements[eid]  # list of node IDs
-                        
-                        # 获取面上的节点 ID 列表
-                        fnodes = self._get_face_nodes(elem_nodes, face_id.upper())
-                        if len(fnodes) < 3: continue
-                        
-                        # 获取该面的节点坐标
-                        coords = []
-                        valid_face = True
-                        for nid in fnodes:
-                            if nid in self.nodes:
-                                coords.append(self.nodes[nid])
-                            else:
-                                valid_face = False
-                                break
-                        if not valid_face: continue
-                        
-                        # 计算几何属性（面积与法向）
-                        area, normal = self._calc_face_geometry(coords)
-                        
-                        # 计算总力向量：F = -p * A * n
-                        total_force = -press_mag * area * normal
-                        
-                        # 简化做法：将总力均匀分配到该面的所有节点
-                        node_force = total_force / len(fnodes)
-                        
-                        for nid in fnodes:
-                            for d in range(3):
-                                if abs(node_force[d]) > 1e-9:
-                                    self.loads.append({
-                                        'node_id': nid,
-                                        'dof': d, # 0,1,2
-                                        'value': node_force[d],
-                                        'from_surface': surf_name_upper  # 标记来源
-                                    })
-
-    def _get_face_nodes(self, node_ids, face_id):
-        """
-        获取 C3D8 单元上指定面的节点 ID。
-
-        约定的节点顺序：
-            1-2-3-4 为底面，5-6-7-8 为顶面。
-        """
-        # 说明：
-        #   为保证法向量朝外，一些实现会调整面节点的排列顺序（如 S1=[1,4,3,2]）。
-        #   这里主要关心节点集合本身，因此只需保持与几何计算一致的顺序即可。
-
-        # 为了便于索引，node_ids 使用 0-based 索引
-        n = node_ids
-        if len(n) < 8: return []
-        
-        idx = []
-        if face_id == 'S1': idx = [0, 3, 2, 1]     # Bottom
-        elif face_id == 'S2': idx = [4, 5, 6, 7]   # Top
-        elif face_id == 'S3': idx = [0, 1, 5, 4]   # Front
-        elif face_id == 'S4': idx = [1, 2, 6, 5]   # Right
-        elif face_id == 'S5': idx = [2, 3, 7, 6]   # Back
-        elif face_id == 'S6': idx = [3, 0, 4, 7]   # Left
-        
-        return [n[i] for i in idx]
+                    eids = self._resolve_ids(target_str, self.elsets)
+                    rows = self._lookup_rows(self._erow, eids)
+                    rows = rows[rows >= 0]
+                    elem_rows.append(rows)
+                    local_faces.append(np.full(len(rows), f))
+                
+                if not elem_rows or self.elem_conn.shape[1] < 8:
+                    continue
+                elem_rows = np.concatenate(elem_rows)
+                local_faces = np.concatenate(local_faces)
+                if len(elem_rows) == 0:
+                    continue
+                
+                # 一次性取出所有面的节点 ID (F, 4)，只保留完整 8 节点单元的面
+                conn = self.elem_conn[elem_rows]
+                face_nids = np.take_along_axis(conn, FACE_IDX[local_faces].astype(np.intp), axis=1)
+                valid = np.all(conn[:, :8] != 0, axis=1)
+                
+                # 面上节点必须都已定义
+                face_rows = self._node_rows(face_nids)
+                valid &= np.all(face_rows >= 0, axis=1)
+                if not np.any(valid):
+                    continue
+                face_nids, face_rows = face_nids[valid], face_rows[valid]
+                
+                # 每个面节点分得同样的力：(F, 3) -> (F, 4, 3)
+                shape = face_nids.shape + (3,)
+                node_force = np.broadcast_to(
+                    self._face_node_forces(face_rows, press_mag)[:, None, :], shape
+                )
+                
+                # 展开成节点力（用于求解器），只记录 (节点, 自由度, 值) 三列；
+                # 用一次布尔掩码筛掉接近 0 的分量，顺序与逐面/逐节点/逐自由度一致
+                mask = np.abs(node_force) > 1e-9
+                self.point_loads_nodes.append(np.broadcast_to(face_nids[:, :, None], shape)[mask])
+                self.point_loads_dofs.append(np.broadcast_to(np.arange(3), shape)[mask])
+                self.point_loads_values.append(node_force[mask])
+
+    def _face_node_forces(self, face_rows, press_mag):
+        """
+        计算每个面上单个节点分得的等效节点力 (F, 3)。
 
-    def _calc_face_geometry(self, coords):
+        总力 F = -p * A * n，简化做法：均匀分配到该面的所有节点。
+        大规模面集合且安装了 Numba 时使用融合内核，否则使用 NumPy 批量计算。
+        """
+        face_rows = np.asarray(face_rows, dtype=np.int64)
+        if NUMBA_AVAILABLE and len(face_rows) >= NUMBA_MIN_FACES:
+            out = np.empty((len(face_rows), 3))
+            _expand_pressure(self.node_coords, face_rows, float(press_mag), out)
+            return out
+        
+        # 批量计算几何属性（面积与法向）：(F, 4, 3) -> (F,), (F, 3)
+        area, normal = self._calc_face_geometry(self.node_coords[face_rows])
+        total_force = (-press_mag * area)[:, None] * normal
+        return total_force / face_rows.shape[1]
+
+    def _node_rows(self, nids):
+        """节点 ID 数组 -> node_coords 行号数组 (同形状)，未定义的节点为 -1。"""
+        return self._lookup_rows(self._nrow, nids)
+
+    @staticmethod
+    def _lookup_rows(row_map, ids):
+        """ID 数组 -> 行号数组 (同形状)，row_map 中不存在的 ID 为 -1。"""
+        ids = np.asarray(ids)
+        flat = np.fromiter(
+            (row_map.get(i, -1) for i in ids.ravel().tolist()),
+            dtype=np.int64, count=ids.size
+        )
+        return flat.reshape(ids.shape)
+
+    def _calc_face_geometry(self, pts):
         """
-        根据四个顶点坐标近似计算平面四边形的面积和法向量。
+        批量计算平面四边形面的面积和法向量。
 
         Args:
-            coords (list[list[float]]): 顶点坐标列表 [x, y, z]
+            pts (np.ndarray): 顶点坐标 (F, 4, 3)
 
         Returns:
-            tuple[float, np.ndarray]: (面积, 单位法向量)。
+            tuple[np.ndarray, np.ndarray]: (面积 (F,), 单位法向量 (F, 3))。
         """
-        # coords: list of [x, y, z]
-        pts = np.array(coords)
-        if len(pts) < 3: return 0.0, np.zeros(3)
-        
         # 对四边形面，采用对角线叉积的一半近似计算面积：
         #   A = P3 - P1, B = P4 - P2,  normal ~ A × B
-        
-        if len(pts) == 4:
-            v1 = pts[2] - pts[0] # Diagonal 1
-            v2 = pts[3] - pts[1] # Diagonal 2
-            cp = np.cross(v1, v2)
-            vn = np.linalg.norm(cp)
-            area = 0.5 * vn
-            normal = cp / (vn + 1e-20)
-            return area, normal
-        else:
-            return 0.0, np.zeros(3)
+        v1 = pts[:, 2] - pts[:, 0] # Diagonal 1
+        v2 = pts[:, 3] - pts[:, 1] # Diagonal 2
+        cp = np.cross(v1, v2)
+        vn = np.linalg.norm(cp, axis=1)
+        area = 0.5 * vn
+        normal = cp / (vn[:, None] + 1e-20)
+        return area, normal
 
     def _process_elastic_block(self, blk):
         """处理 *ELASTIC 数据块，提取 E 和 nu"""
@@ -526,10 +754,9 @@ class InpParser:
         vals = self._parse_csv_matrix(blk)
         if len(vals) > 0 and len(vals[0]) >= 2:
             # 第一行：E, nu
-            E = float(vals[0][0])
-            nu = float(vals[0][1])
-            self.materials[self.current_material]['E'] = E
-            self.materials[self.current_material]['nu'] = nu
+            mat = self._current_props
+            mat['E'] = float(vals[0][0])
+            mat['nu'] = float(vals[0][1])
 
     def _process_density_block(self, blk):
         """处理 *DENSITY 数据块，提取密度值"""
@@ -540,8 +767,7 @@ class InpParser:
         vals = self._parse_csv_matrix(blk)
         if len(vals) > 0 and len(vals[0]) >= 1:
             # 第一行第一个值：密度
-            density = float(vals[0][0])
-            self.materials[self.current_material]['density'] = density
+            self._current_props['density'] = float(vals[0][0])
 
     def _process_plastic_block(self, blk):
         """
@@ -560,7 +786,7 @@ class InpParser:
             # 第二个值(如果有)：塑性应变，用于硬化曲线，简化处理暂不使用
             plastic_strain = float(vals[0][1]) if len(vals[0]) >= 2 else 0.0
             
-            self.materials[self.current_material]['plastic'] = {
+            self._current_props['plastic'] = {
                 'yield_stress': yield_stress,
                 'hardening': 0.0  # 理想塑性，无硬化
             }
@@ -1,6 +1,70 @@
+import functools
+import itertools
+
 import numpy as np
 import pyvista as pv
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 应力分量字段名，对应 stress_components 的列顺序 σx, σy, σz, τxy, τyz, τxz
+STRESS_LABELS = ("S11", "S22", "S33", "S12", "S23", "S13")
+
+# VTK 的 vtkIdType 对应的整数类型 (通常为 int64)；单元数组按此类型构建，VTK 可直接引用而不转换
+VTK_ID_TYPE = getattr(pv, 'ID_TYPE', np.int64)
+
+# 约束自由度 -> 符号方向所在坐标轴 (转动自由度 rx/ry/rz 画在垂直方向 y/z/x)
+_BC_AXIS = np.array([0, 1, 2, 1, 2, 0])
+
+# get_scalar_range 分块求极值的块长 (64K 个 float64 = 512KB，可留在 L2 缓存中)
+MINMAX_BLOCK = 65536
+
+# 行数超过该阈值时才使用 Numba 内核 (小规模结果不值得付出首次 JIT 编译开销)
+NUMBA_MIN_ROWS = 200000
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _vm_kernel(s, out):
+        """逐行并行计算 Von Mises 应力：一次读入 6 个分量，写出 1 个结果。"""
+        for i in prange(s.shape[0]):
+            a = s[i, 0] - s[i, 1]
+            b = s[i, 1] - s[i, 2]
+            c = s[i, 2] - s[i, 0]
+            out[i] = np.sqrt(0.5 * (a * a + b * b + c * c)
+                             + 3.0 * (s[i, 3] * s[i, 3] + s[i, 4] * s[i, 4] + s[i, 5] * s[i, 5]))
+
+
+@functools.lru_cache(maxsize=64)
+def _is_mpl_cmap(cmap_name):
+    """cmap_name 是否为 Matplotlib 可识别的颜色映射 (结果缓存，避免重复解析)"""
+    try:
+        import matplotlib.pyplot as plt
+        plt.get_cmap(cmap_name)
+        return True
+    except Exception:
+        return False
+
+
+def _minmax(data):
+    """
+    一次遍历求数组的 (min, max)：逐块调用 min/max，同一块的第二次读取命中缓存，
+    主存只读一遍；NaN 与 np.min/np.max 一样向外传播。
+    """
+    a = np.ravel(data)
+    n_blocks = -(-a.size // MINMAX_BLOCK)
+    lo = np.empty(n_blocks, dtype=a.dtype)
+    hi = np.empty(n_blocks, dtype=a.dtype)
+    for j in range(n_blocks):
+        block = a[j * MINMAX_BLOCK:(j + 1) * MINMAX_BLOCK]
+        lo[j] = block.min()
+        hi[j] = block.max()
+    return lo.min(), hi.max()
+
+
 class FEMVisualizer:
     """
     有限元结果可视化辅助类。
@@ -17,8 +81,27 @@ class FEMVisualizer:
         'rainbow', 'turbo', 'hot', 'cool', 'spring', 'summer', 'autumn', 'winter',
         'bone', 'copper', 'pink', 'gray', 'RdYlBu', 'RdYlGn', 'RdBu', 'Spectral'
     ]
+    # 供 validate_cmap 做 O(1) 查找；AVAILABLE_CMAPS 保持列表以维持界面中的显示顺序
+    _CMAP_SET = frozenset(AVAILABLE_CMAPS)
     
-    def parse_mesh_to_vtk(self, nodes, elements, displacement=None, stress=None, stress_components=None):
+    def __init__(self):
+        # 最近一次 _build_node_arrays 的 (nodes_map, 结果)，供约束/载荷符号共用
+        self._node_arrays = None
+        # 最近一次 parse_mesh_to_vtk 构建的网格及其 (nodes, elements, 坐标精度)
+        self._grid_cache = None
+        self._cache_key = None
+        # 单位尺寸的符号几何 (首次使用时创建)，由 glyph 的 factor 缩放到模型尺寸
+        self._cone_geom = None
+        self._arrow_geom = None
+    
+    def invalidate_mesh(self):
+        """丢弃缓存的网格与节点数组 (原地修改了节点/单元数据后调用)"""
+        self._node_arrays = None
+        self._grid_cache = None
+        self._cache_key = None
+    
+    def parse_mesh_to_vtk(self, nodes, elements, displacement=None, stress=None, stress_components=None,
+                          coord_dtype=np.float64):
         """
         将节点和单元转换为 PyVista 非结构化网格
 
@@ -32,50 +115,72 @@ class FEMVisualizer:
             displacement (np.ndarray | None): 节点位移 (N×3)
             stress (np.ndarray | None): 节点标量应力（例如 Von Mises）
             stress_components (np.ndarray | None): 节点应力分量 (N×6)
+            coord_dtype: 节点坐标的存储精度，默认 float64。仅显示网格时可传 np.float32
+                减半坐标内存；需要叠加小位移 (warp_by_vector) 时应保持 float64
 
         Returns:
             pv.UnstructuredGrid: 已附加结果字段的网格对象。
+
+        传给 VTK 的单元数组为 VTK_ID_TYPE、单元类型为 uint8、坐标为 C 连续的
+        coord_dtype 数组，均无需 VTK 再做类型转换。
+
+        同一组 nodes / elements 对象再次调用时复用上次构建的网格：返回其浅拷贝
+        (共享点与单元数组，point_data 各自独立)，不会改动之前返回、仍在显示的网格；
+        拓扑变化时传入新对象或先调用 invalidate_mesh()。
         """
+        coord_dtype = np.dtype(coord_dtype)
+        key = self._cache_key
+        if (key is not None and key[0] is nodes and key[1] is elements and key[2] == coord_dtype
+                and self._grid_cache.n_points == len(nodes)
+                and self._grid_cache.n_cells == len(elements)):
+            grid = self._grid_cache.copy(deep=False)
+            self._bind_results(grid, displacement, stress, stress_components)
+            return grid
+
         # 1. 处理节点数据
+        row_ids, node_coords = self._node_table(nodes, coord_dtype)
         if isinstance(nodes, dict):
-            # 检查第一个值是什么类型
-            first_value = next(iter(nodes.values()))
-            if isinstance(first_value, list) and len(first_value) == 3:
-                # INP格式: {node_id: [x, y, z]}
-                sorted_ids = sorted(nodes.keys())
-                node_coords = np.array([nodes[nid] for nid in sorted_ids])
-                id_map = {nid: i for i, nid in enumerate(sorted_ids)}
-            else:
-                # 对象格式: {node_id: Node对象}
-                sorted_ids = sorted(nodes.keys())
-                node_coords = np.array([nodes[nid].coords for nid in sorted_ids])
-                id_map = {nid: i for i, nid in enumerate(sorted_ids)}
-        else:
-            # 列表格式: [Node对象]
-            node_coords = np.array([n.coords for n in nodes])
-            id_map = {n.id: i for i, n in enumerate(nodes)}
+            # 字典格式按节点 ID 排序重排 (列表格式保持原顺序)
+            order = np.argsort(row_ids, kind='stable')
+            row_ids = row_ids[order]
+            node_coords = node_coords[order]
+        id_lut = self._build_id_lut(row_ids)
 
         # 2. 处理单元连接关系（目前仅支持 8 节点六面体）
-        cells = []
-        cell_types = []
-        
+        n_elem = len(elements)
         if isinstance(elements, dict):
-            # INP格式: {elem_id: [n1, n2, ...]}
-            for elem_nodes in elements.values():
-                cells.append(8)  # 8节点六面体
-                cells.extend([id_map[nid] for nid in elem_nodes])
-                cell_types.append(12)  # VTK_HEXAHEDRON
+            # INP格式: {elem_id: [n1, n2, ...]}，直接串联各单元的节点列表，不逐个产生中间对象
+            elem_node_ids = itertools.chain.from_iterable(elements.values())
         else:
             # 对象格式: [Element对象]
-            for elem in elements:
-                cells.append(8)
-                cells.extend([id_map[n.id] for n in elem.nodes])
-                cell_types.append(12) # VTK_HEXAHEDRON
+            elem_node_ids = (n.id for elem in elements for n in elem.nodes)
+        raw = np.fromiter(elem_node_ids, dtype=np.int64, count=n_elem * 8)
+        conn = self._id_rows(raw, row_ids, id_lut)
+        if np.any(conn < 0):
+            # 单元引用了未定义的节点
+            raise KeyError(int(raw[np.argmax(conn < 0)]))
+        
+        # VTK 单元数组：每个单元一行 [8, i1, ..., i8]，按 vtkIdType 预分配后整体填充
+        cells = np.empty((n_elem, 9), dtype=VTK_ID_TYPE)
+        cells[:, 0] = 8  # 8节点六面体
+        cells[:, 1:] = conn.reshape(n_elem, 8)
+        cell_types = np.full(n_elem, 12, dtype=np.uint8)  # VTK_HEXAHEDRON
 
-        # 3. 创建 PyVista 网格
-        grid = pv.UnstructuredGrid(cells, cell_types, node_coords)
+        # 3. 创建 PyVista 网格 (三个数组均为 C 连续且类型与 VTK 一致，构造时不再转换)
+        node_coords = np.ascontiguousarray(node_coords)
+        grid = pv.UnstructuredGrid(cells.ravel(), cell_types, node_coords)
+        # 缓存不带结果字段的网格，结果只绑定到返回的浅拷贝上
+        self._grid_cache = grid
+        self._cache_key = (nodes, elements, coord_dtype)
+        grid = grid.copy(deep=False)
 
         # 4. 绑定结果
+        self._bind_results(grid, displacement, stress, stress_components)
+        return grid
+
+    @staticmethod
+    def _bind_results(grid, displacement, stress, stress_components):
+        """将位移、Von Mises 与应力分量写入 grid.point_data"""
         if displacement is not None:
             grid.point_data["Displacement"] = displacement
             
@@ -83,16 +188,93 @@ class FEMVisualizer:
             grid.point_data["VonMises"] = stress
             
         if stress_components is not None:
-            # 添加应力分量
-            grid.point_data["S11"] = stress_components[:, 0]  # σx
-            grid.point_data["S22"] = stress_components[:, 1]  # σy
-            grid.point_data["S33"] = stress_components[:, 2]  # σz
-            grid.point_data["S12"] = stress_components[:, 3]  # τxy
-            grid.point_data["S23"] = stress_components[:, 4]  # τyz
-            grid.point_data["S13"] = stress_components[:, 5]  # τxz
+            # 添加应力分量：转为列主序后每一列都是连续内存，可直接交给 VTK 而无需再拷贝
+            sc = np.asfortranarray(stress_components, dtype=np.float64)
+            for k, label in enumerate(STRESS_LABELS):
+                grid.point_data[label] = sc[:, k]
 
-        return grid
+    def _node_table(self, nodes, dtype=np.float64):
+        """
+        节点集合 -> (ID 数组 (N,), 坐标数组 (N, 3))，保持输入顺序。
+        
+        支持 {node_id: [x, y, z]}、{node_id: Node对象} 与 [Node对象] 三种格式，
+        parse_mesh_to_vtk 与约束/载荷符号共用这一转换；坐标直接按 dtype 写入。
+        """
+        if not isinstance(nodes, dict):
+            # 列表格式: [Node对象]
+            ids = np.fromiter((n.id for n in nodes), dtype=np.int64, count=len(nodes))
+            return ids, self._stack_coords((n.coords for n in nodes), len(nodes), dtype)
+        # 检查第一个值是什么类型
+        first_value = next(iter(nodes.values()))
+        if isinstance(first_value, list) and len(first_value) == 3:
+            # INP格式: {node_id: [x, y, z]}
+            coord_rows = nodes.values()
+        else:
+            # 对象格式: {node_id: Node对象}
+            coord_rows = (n.coords for n in nodes.values())
+        ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        return ids, self._stack_coords(coord_rows, len(nodes), dtype)
+    
+    def _build_node_arrays(self, nodes_map):
+        """
+        节点字典 -> (ID 数组 (N,), 坐标数组 (N, 3), ID 查找表, 包围盒对角线长度)
+        
+        同一个 nodes_map 连续调用 (create_bc_actors 后接 create_load_actors)
+        时直接复用上次的结果，不再重复转换和求包围盒。
+        """
+        cached = self._node_arrays
+        if cached is not None and cached[0] is nodes_map and len(cached[1][0]) == len(nodes_map):
+            return cached[1]
+        row_ids, coords = self._node_table(nodes_map)
+        bbox_diagonal = np.linalg.norm(coords.max(axis=0) - coords.min(axis=0)) if coords.size else 0.0
+        arrays = (row_ids, coords, self._build_id_lut(row_ids), bbox_diagonal)
+        self._node_arrays = (nodes_map, arrays)
+        return arrays
+    
+    @staticmethod
+    def _set_node_ids(item, nsets):
+        """约束/载荷条目作用的节点 ID 数组；集合不存在或条目无目标时返回 None。"""
+        if 'set_name' in item:
+            if item['set_name'] not in nsets:
+                return None
+            return np.asarray(nsets[item['set_name']], dtype=np.int64)
+        if 'node_id' in item:
+            return np.array([item['node_id']], dtype=np.int64)
+        return None
+    
+    @staticmethod
+    def _build_id_lut(row_ids):
+        """
+        构建节点 ID -> 行号的稠密查找表，未出现的 ID 对应 -1。
 
+        ID 过于稀疏 (最大 ID 超过节点数的 10 倍) 时返回 None，由 _id_rows 退回字典查找。
+        """
+        if len(row_ids) == 0 or row_ids.min() < 0:
+            return None
+        max_id = int(row_ids.max())
+        if max_id > 10 * len(row_ids):
+            return None
+        lut = np.full(max_id + 1, -1, dtype=np.int64)
+        lut[row_ids] = np.arange(len(row_ids))
+        return lut
+    
+    @staticmethod
+    def _id_rows(ids, row_ids, id_lut):
+        """批量将节点 ID 映射为行号，未定义的 ID 为 -1。"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if id_lut is None:
+            id_map = dict(zip(row_ids.tolist(), range(len(row_ids))))
+            return np.fromiter((id_map.get(i, -1) for i in ids.tolist()),
+                               dtype=np.int64, count=len(ids))
+        inside = (ids >= 0) & (ids < len(id_lut))
+        return np.where(inside, id_lut[np.where(inside, ids, 0)], -1)
+    
+    @staticmethod
+    def _stack_coords(coord_rows, n, dtype=np.float64):
+        """将 n 个三维坐标 (列表或数组) 直接写入 (n, 3) 数组 (默认 float64)，不生成中间列表。"""
+        flat = np.fromiter(itertools.chain.from_iterable(coord_rows), dtype=dtype, count=3 * n)
+        return flat.reshape(n, 3)
+    
     @staticmethod
     def calc_von_mises(stress_tensor):
         """
@@ -105,18 +287,21 @@ class FEMVisualizer:
         Returns:
             np.ndarray: 形状为 (N,) 的 Von Mises 应力。
         """
-        sx = stress_tensor[:, 0]
-        sy = stress_tensor[:, 1]
-        sz = stress_tensor[:, 2]
-        sxy = stress_tensor[:, 3]
-        syz = stress_tensor[:, 4]
-        szx = stress_tensor[:, 5]
-        
-        term1 = (sx - sy)**2 + (sy - sz)**2 + (sz - sx)**2
-        term2 = 6 * (sxy**2 + syz**2 + szx**2)
-        
-        vm = np.sqrt(0.5 * (term1 + term2))
-        return vm
+        s = np.asarray(stress_tensor, dtype=float)
+        if NUMBA_AVAILABLE and s.ndim == 2 and len(s) >= NUMBA_MIN_ROWS:
+            out = np.empty(len(s))
+            _vm_kernel(np.ascontiguousarray(s), out)
+            return out
+        
+        norm, shear = s[:, :3], s[:, 3:]
+        
+        # 正应力差 [σx-σy, σy-σz, σz-σx] 一次算出，平方和用 einsum 逐行归约，
+        # 不再为每一项单独分配临时数组
+        diff = norm - norm[:, [1, 2, 0]]
+        vm = np.einsum('ij,ij->i', diff, diff)
+        vm += 6.0 * np.einsum('ij,ij->i', shear, shear)
+        vm *= 0.5
+        return np.sqrt(vm, out=vm)
     
     @staticmethod
     def get_scalar_range(grid, scalar_name, custom_range=None):
@@ -138,7 +323,8 @@ class FEMVisualizer:
         if custom_range is not None and len(custom_range) == 2:
             return custom_range[0], custom_range[1]
         
-        return float(np.min(data)), float(np.max(data))
+        min_val, max_val = _minmax(data)
+        return float(min_val), float(max_val)
     
     @staticmethod
     def validate_cmap(cmap_name):
@@ -150,15 +336,12 @@ class FEMVisualizer:
         Returns:
             str: 一个可在 PyVista / Matplotlib 中使用的颜色映射名称。
         """
-        if cmap_name in FEMVisualizer.AVAILABLE_CMAPS:
+        if cmap_name in FEMVisualizer._CMAP_SET:
             return cmap_name
         # 如果不在预设列表中，尝试使用 Matplotlib 的内置映射
-        try:
-            import matplotlib.pyplot as plt
-            plt.get_cmap(cmap_name)
+        if _is_mpl_cmap(cmap_name):
             return cmap_name
-        except Exception:
-            return 'jet'  # 默认返回jet
+        return 'jet'  # 默认返回jet
     
     def create_bc_actors(self, model_data, nodes_map=None):
         """
@@ -170,7 +353,7 @@ class FEMVisualizer:
 
         Args:
             model_data (dict): 至少包含 'constraints' 与 'nodes' 的模型数据字典。
-            nodes_map (dict | None): 节点坐标映射 {node_id: [x, y, z]} 或 Node 对象。
+            nodes_map (dict | list | None): 节点坐标映射 {node_id: [x, y, z]}、{node_id: Node对象} 或 [Node对象]。
                 若为 None，则默认从 model_data['nodes'] 中获取。
 
         Returns:
@@ -181,6 +364,31 @@ class FEMVisualizer:
         if 'constraints' not in model_data or not model_data['constraints']:
             return actors
         
+        # 获取 nsets 用于展开 set_name 约束
+        nsets = model_data.get('nsets', {})
+        
+        # 先收集所有约束的 (节点 ID, 自由度)，每条约束展开为一段数组；
+        # 没有可绘制的约束时不必处理节点数据
+        flat_ids = []
+        flat_dofs = []
+        
+        for cons in model_data['constraints']:
+            # 处理 set_name / node_id 约束
+            node_ids = self._set_node_ids(cons, nsets)
+            if node_ids is None:
+                continue
+            
+            # 集合约束一条记录包含多个自由度 ('dofs')
+            dofs = np.atleast_1d(np.asarray(
+                cons['dofs'] if 'dofs' in cons else cons.get('dof', 0), dtype=np.int64
+            ))
+            # 自由度在外层、节点在内层
+            flat_ids.append(np.tile(node_ids, len(dofs)))
+            flat_dofs.append(np.repeat(dofs, len(node_ids)))
+        
+        if not flat_ids:
+            return actors
+        
         # 获取节点数据
         if nodes_map is None:
             nodes_map = model_data.get('nodes', {})
@@ -188,104 +396,57 @@ class FEMVisualizer:
         if not nodes_map:
             return actors
         
-        # 处理节点格式
-        if isinstance(nodes_map, dict):
-            first_value = next(iter(nodes_map.values()))
-            if isinstance(first_value, list) and len(first_value) == 3:
-                # INP格式: {node_id: [x, y, z]}
-                node_coords_map = {nid: np.array(coords) for nid, coords in nodes_map.items()}
-            else:
-                # 对象格式: {node_id: Node对象}
-                node_coords_map = {nid: np.array(node.coords) for nid, node in nodes_map.items()}
+        # 处理节点格式：整理为坐标数组 + ID 查找表，之后批量按 ID 取坐标
+        if isinstance(nodes_map, (dict, list)):
+            row_ids, all_coords, id_lut, bbox_diagonal = self._build_node_arrays(nodes_map)
         else:
             return actors
         
-        # 获取 nsets 用于展开 set_name 约束
-        nsets = model_data.get('nsets', {})
-        
-        # 计算网格边界框对角线长度用于缩放符号尺寸
-        all_coords = np.array(list(node_coords_map.values()))
-        if len(all_coords) == 0:
+        # 网格边界框对角线长度 (用于缩放符号尺寸) 已随节点数组一并求出
+        if all_coords.size == 0:
             return actors
         
-        bbox_min = np.min(all_coords, axis=0)
-        bbox_max = np.max(all_coords, axis=0)
-        bbox_diagonal = np.linalg.norm(bbox_max - bbox_min)
         # 约束符号高度取对角线的 1%，为短而尖的圆锥，尖端在节点处
         glyph_height = bbox_diagonal * 0.01
         
-        # 收集所有约束节点
-        bc_points = []
-        bc_directions = []
-        
-        for cons in model_data['constraints']:
-            node_ids = []
-            
-            # 处理 set_name 约束
-            if 'set_name' in cons:
-                set_name = cons['set_name']
-                if set_name in nsets:
-                    node_ids = nsets[set_name]
-                else:
-                    continue
-            elif 'node_id' in cons:
-                node_ids = [cons['node_id']]
-            else:
-                continue
-            
-            dof = cons.get('dof', 0)
-            
-            # 为每个节点创建约束可视化
-            for nid in node_ids:
-                if nid not in node_coords_map:
-                    continue
-                
-                point = node_coords_map[nid]
-                bc_points.append(point)
-                
-                # 根据 DOF 确定方向
-                # DOF 0=x, 1=y, 2=z, 3=rx, 4=ry, 5=rz
-                if dof < 3:
-                    # 平动自由度：方向沿坐标轴
-                    direction = np.zeros(3)
-                    direction[dof] = 1.0
-                else:
-                    # 转动自由度：使用垂直于坐标轴的方向
-                    direction = np.zeros(3)
-                    if dof == 3:  # rx -> 绕x轴，显示为y方向
-                        direction[1] = 1.0
-                    elif dof == 4:  # ry -> 绕y轴，显示为z方向
-                        direction[2] = 1.0
-                    elif dof == 5:  # rz -> 绕z轴，显示为x方向
-                        direction[0] = 1.0
-                
-                bc_directions.append(direction)
-        
-        if len(bc_points) == 0:
+        # 一次性按 ID 取坐标，跳过未定义的节点
+        rows = self._id_rows(np.concatenate(flat_ids), row_ids, id_lut)
+        keep = rows >= 0
+        rows, flat_dofs = rows[keep], np.concatenate(flat_dofs)[keep]
+        if len(rows) == 0:
             return actors
         
         # 创建 PolyData
-        bc_points_array = np.array(bc_points)
-        bc_directions_array = np.array(bc_directions)
+        bc_points_array = all_coords[rows]
+        
+        # 根据 DOF 确定方向：DOF 0=x, 1=y, 2=z 沿坐标轴；
+        # 3=rx, 4=ry, 5=rz 使用垂直于转轴的方向 (分别显示为 y, z, x 方向)
+        bc_directions_array = np.zeros((len(rows), 3))
+        valid = (flat_dofs >= 0) & (flat_dofs < 6)
+        bc_directions_array[np.flatnonzero(valid), _BC_AXIS[flat_dofs[valid]]] = 1.0
         
         # 调整点位置：圆锥的尖端应落在节点位置
         # 由于 Cone 的尖端在 z=0，需要将点沿方向反向平移高度的一半
-        adjusted_bc_points = bc_points_array - bc_directions_array * glyph_height * 0.5
+        # (原地 ufunc，只分配一次结果数组)
+        adjusted_bc_points = np.empty_like(bc_points_array)
+        np.multiply(bc_directions_array, glyph_height * 0.5, out=adjusted_bc_points)
+        np.subtract(bc_points_array, adjusted_bc_points, out=adjusted_bc_points)
         
         # 创建点云
         point_cloud = pv.PolyData(adjusted_bc_points)
         point_cloud['vectors'] = bc_directions_array
         
         # 使用 Cone 作为 Glyph（direction=(0,0,-1) 使尖端指向局部 -z）
-        # 半径约为高度的 0.15 倍，使圆锥既尖锐又清晰
-        cone = pv.Cone(radius=glyph_height * 0.15, height=glyph_height, direction=(0, 0, -1))
+        # 单位高度的圆锥只创建一次，半径约为高度的 0.15 倍，使圆锥既尖锐又清晰
+        if self._cone_geom is None:
+            self._cone_geom = pv.Cone(radius=0.15, height=1.0, direction=(0, 0, -1))
         
-        # 创建 Glyph（不使用缩放数组，因为 Cone 已设置好物理尺寸）
+        # 创建 Glyph（不使用缩放数组，以 factor 将单位圆锥统一缩放到 glyph_height）
         glyph = point_cloud.glyph(
             orient='vectors',
             scale=False,
-            factor=1.0,  # 使用 factor=1.0 应用 Cone 的原始尺寸
-            geom=cone
+            factor=glyph_height,
+            geom=self._cone_geom
         )
         
         # 返回 PolyData 对象和颜色信息，交由外部 plotter 创建 Actor
@@ -305,7 +466,7 @@ class FEMVisualizer:
 
         Args:
             model_data (dict): 至少包含 'loads' 与 'nodes' 的模型数据字典。
-            nodes_map (dict | None): 节点坐标映射 {node_id: [x, y, z]} 或 Node 对象。
+            nodes_map (dict | list | None): 节点坐标映射 {node_id: [x, y, z]}、{node_id: Node对象} 或 [Node对象]。
                 若为 None，则默认从 model_data['nodes'] 中获取。
 
         Returns:
@@ -316,6 +477,48 @@ class FEMVisualizer:
         if 'loads' not in model_data or not model_data['loads']:
             return actors
         
+        # 获取 nsets 用于展开 set_name 载荷
+        nsets = model_data.get('nsets', {})
+        
+        # 先收集所有载荷的 (节点 ID, 自由度, 值)，每条载荷展开为一段数组；
+        # 没有可绘制的载荷时不必处理节点数据
+        flat_ids = []
+        flat_dofs = []
+        flat_vals = []
+        
+        for load in model_data['loads']:
+            # 跳过 surface 载荷（它们已经展开成节点力，见下方 point_loads）
+            if 'surface_name' in load:
+                continue
+            
+            # 处理 set_name / node_id 载荷
+            node_ids = self._set_node_ids(load, nsets)
+            if node_ids is None:
+                continue
+            
+            flat_ids.append(node_ids)
+            flat_dofs.append(np.full(len(node_ids), load.get('dof', 0), dtype=np.int64))
+            flat_vals.append(np.full(len(node_ids), load.get('value', 0.0), dtype=float))
+        
+        # 面载荷展开的等效节点力 (列式数组)
+        point_loads = model_data.get('point_loads')
+        if point_loads is not None:
+            flat_ids.append(np.asarray(point_loads['node_ids'], dtype=np.int64))
+            flat_dofs.append(np.asarray(point_loads['dofs'], dtype=np.int64))
+            flat_vals.append(np.asarray(point_loads['values'], dtype=float))
+        
+        if not flat_ids:
+            return actors
+        
+        # 只处理平动自由度 (0, 1, 2) 的载荷
+        flat_ids = np.concatenate(flat_ids)
+        flat_dofs = np.concatenate(flat_dofs)
+        flat_vals = np.concatenate(flat_vals)
+        keep = (flat_dofs >= 0) & (flat_dofs < 3)
+        if not keep.any():
+            return actors
+        flat_ids, flat_dofs, flat_vals = flat_ids[keep], flat_dofs[keep], flat_vals[keep]
+        
         # 获取节点数据
         if nodes_map is None:
             nodes_map = model_data.get('nodes', {})
@@ -323,100 +526,47 @@ class FEMVisualizer:
         if not nodes_map:
             return actors
         
-        # 处理节点格式
-        if isinstance(nodes_map, dict):
-            first_value = next(iter(nodes_map.values()))
-            if isinstance(first_value, list) and len(first_value) == 3:
-                # INP格式: {node_id: [x, y, z]}
-                node_coords_map = {nid: np.array(coords) for nid, coords in nodes_map.items()}
-            else:
-                # 对象格式: {node_id: Node对象}
-                node_coords_map = {nid: np.array(node.coords) for nid, node in nodes_map.items()}
+        # 处理节点格式：整理为坐标数组 + ID 查找表，之后批量按 ID 取坐标
+        if isinstance(nodes_map, (dict, list)):
+            row_ids, all_coords, id_lut, bbox_diagonal = self._build_node_arrays(nodes_map)
         else:
             return actors
         
-        # 获取 nsets 用于展开 set_name 载荷
-        nsets = model_data.get('nsets', {})
-        
-        # 计算网格边界框对角线长度用于决定箭头长度
-        all_coords = np.array(list(node_coords_map.values()))
-        if len(all_coords) == 0:
+        # 网格边界框对角线长度 (用于决定箭头长度) 已随节点数组一并求出
+        if all_coords.size == 0:
             return actors
         
-        bbox_min = np.min(all_coords, axis=0)
-        bbox_max = np.max(all_coords, axis=0)
-        bbox_diagonal = np.linalg.norm(bbox_max - bbox_min)
-        
-        # 收集所有载荷
-        load_points = []
-        load_vectors = []
-        
-        for load in model_data['loads']:
-            # 跳过 surface 载荷（它们已经展开成节点力了）
-            if 'surface_name' in load:
-                continue
-            
-            node_ids = []
-            
-            # 处理 set_name 载荷
-            if 'set_name' in load:
-                set_name = load['set_name']
-                if set_name in nsets:
-                    node_ids = nsets[set_name]
-                else:
-                    continue
-            elif 'node_id' in load:
-                node_ids = [load['node_id']]
-            else:
-                continue
-            
-            dof = load.get('dof', 0)
-            value = load.get('value', 0.0)
-            
-            # 只处理平动自由度 (0, 1, 2) 的载荷
-            if dof >= 3:
-                continue
-            
-            # 为每个节点创建载荷可视化
-            for nid in node_ids:
-                if nid not in node_coords_map:
-                    continue
-                
-                point = node_coords_map[nid]
-                load_points.append(point)
-                
-                # 根据 DOF 和 value 确定力向量
-                force_vector = np.zeros(3)
-                force_vector[dof] = value
-                
-                load_vectors.append(force_vector)
-        
-        if len(load_points) == 0:
+        # 跳过未定义的节点
+        rows = self._id_rows(flat_ids, row_ids, id_lut)
+        keep = rows >= 0
+        rows, flat_dofs, flat_vals = rows[keep], flat_dofs[keep], flat_vals[keep]
+        if len(rows) == 0:
             return actors
         
-        # 创建 PolyData
-        load_points_array = np.array(load_points)
-        load_vectors_array = np.array(load_vectors)
+        # 创建 PolyData：根据 DOF 和 value 确定力向量
+        load_points_array = all_coords[rows]
+        load_vectors_array = np.zeros((len(rows), 3))
+        load_vectors_array[np.arange(len(rows)), flat_dofs] = flat_vals
         
         # 计算力向量的大小用于缩放
         force_magnitudes = np.linalg.norm(load_vectors_array, axis=1)
-        max_force = np.max(force_magnitudes) if len(force_magnitudes) > 0 else 1.0
+        max_force = force_magnitudes.max(initial=1.0)
         
-        # 归一化方向向量
-        load_directions = load_vectors_array.copy()
-        for i in range(len(load_directions)):
-            mag = np.linalg.norm(load_directions[i])
-            if mag > 1e-10:
-                load_directions[i] = load_directions[i] / mag
-            else:
-                load_directions[i] = np.array([1, 0, 0])  # 默认方向
+        # 归一化方向向量 (整体按行归一化，零载荷跳过除法并使用默认方向)
+        safe = force_magnitudes > 1e-10
+        load_directions = np.empty_like(load_vectors_array)
+        np.divide(load_vectors_array, force_magnitudes[:, None], out=load_directions,
+                  where=safe[:, None])
+        load_directions[~safe] = (1.0, 0.0, 0.0)  # 默认方向
         
         # 箭头长度取对角线的 4%，保证在大多数模型尺寸下可见而不过分夸张
         arrow_length = bbox_diagonal * 0.04
         
         # 调整点位置，使箭头尾部落在节点处：
         # 箭头从 (point - direction * arrow_length) 指向 point
-        adjusted_load_points = load_points_array - load_directions * arrow_length
+        adjusted_load_points = np.empty_like(load_points_array)
+        np.multiply(load_directions, arrow_length, out=adjusted_load_points)
+        np.subtract(load_points_array, adjusted_load_points, out=adjusted_load_points)
         
         # 创建点云（使用调整后的点位置）
         point_cloud = pv.PolyData(adjusted_load_points)
@@ -425,25 +575,27 @@ class FEMVisualizer:
         # 使用 Arrow 作为 Glyph。
         # PyVista 的 Arrow 构造函数在不同版本中的参数略有差异，
         # 这里先尝试“详细参数”，失败时退化为无参构造以提高兼容性。
-        try:
-            # 尝试使用标准参数（PyVista 0.32+）
-            arrow = pv.Arrow(
-                tip_length=0.25,
-                tip_radius=0.1,
-                shaft_radius=0.05,
-                shaft_resolution=10,
-                tip_resolution=10
-            )
-        except (TypeError, ValueError):
-            # 如果参数不匹配，使用最简单的创建方式（无参数）
-            arrow = pv.Arrow()
+        # 单位长度的箭头只创建一次
+        if self._arrow_geom is None:
+            try:
+                # 尝试使用标准参数（PyVista 0.32+）
+                self._arrow_geom = pv.Arrow(
+                    tip_length=0.25,
+                    tip_radius=0.1,
+                    shaft_radius=0.05,
+                    shaft_resolution=10,
+                    tip_resolution=10
+                )
+            except (TypeError, ValueError):
+                # 如果参数不匹配，使用最简单的创建方式（无参数）
+                self._arrow_geom = pv.Arrow()
         
         # 创建 Glyph：使用统一缩放因子，避免因力值尺度不同导致箭头过大或不可见
         glyph = point_cloud.glyph(
             orient='vectors',
             scale=False,  # 不使用缩放数组，使用统一的 factor
             factor=arrow_length,  # 使用箭头长度作为缩放因子
-            geom=arrow
+            geom=self._arrow_geom
         )
         
         # 返回 PolyData 对象和颜色信息，由外部 plotter 创建实际 Actor